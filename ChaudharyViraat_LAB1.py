@@ -1,9 +1,53 @@
 import csv          # Importing the csv module to handle reading and writing CSV files.
-import base64       # For encoding and decoding passwords securely.
+import base64       # For encoding password hash salts/digests and reading legacy base64 passwords.
 import os           # For file handling operations.
-import time         # To measure execution time for searching and sorting operations.
+import time         # For operation latencies, timestamps and TTLs.
 import unittest     # For unit testing the application.
-import statistics   # For calculating medians.
+import statistics   # For benchmark summaries and cross-checking the incremental statistics in the unit tests.
+import json         # For encoding write-ahead journal entries.
+import sys          # For command-line arguments (bulk import).
+import bisect       # For keeping students ordered by marks without re-sorting.
+import math         # For validating parsed marks and percentile arithmetic.
+from collections import Counter, OrderedDict   # For grade histograms and the LRU login cache.
+from itertools import chain, groupby, islice, repeat   # For streamed report rows, the marks index and CSV chunk jobs.
+import io           # For parsing CSV chunks from bytes, and capturing report output in the unit tests.
+import hashlib      # For fingerprinting CSV files behind their binary snapshots.
+import mmap         # For reading binary snapshots through shared, memory-mapped pages.
+import pickle       # For passing parsed CSV chunks back from the parser processes.
+import struct       # For the binary snapshot trailer.
+import sqlite3      # For the optional SQLite storage backend.
+import uuid         # For tagging journal entries with the session that wrote them.
+import contextlib   # For the cross-process file lock context manager.
+import threading    # For the reader-writer lock that makes CheckMyGradeApp thread-safe.
+import functools    # For wrapping CheckMyGradeApp methods in the reader-writer lock.
+import atexit       # For flushing write-behind apps at interpreter exit.
+import operator     # For extracting CSV row values in header order.
+import shutil       # For copying CSV backups where hard links are unavailable.
+import hmac         # For constant-time password comparison and the login cache's password MACs.
+import asyncio      # For the local HTTP/JSON service front-end.
+from concurrent.futures import ThreadPoolExecutor   # For running app calls and disk flushes off the event loop.
+from concurrent.futures import ProcessPoolExecutor  # For parsing large CSV files on every core.
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit, parse_qs, unquote   # For parsing service request targets.
+import argparse     # For the benchmark suite's command-line options.
+import platform     # For recording the interpreter and machine alongside benchmark results.
+import tempfile     # For running the benchmark suite away from the real CSV files.
+import multiprocessing   # For starting CSV parser processes without forking the app's threads.
+import gc           # For pausing the cyclic garbage collector while parsed CSV chunks are unpickled.
+import cProfile     # For profiling single CLI commands.
+import pstats       # For printing those profiles.
+import inspect      # For timing generator functions (such as CSV row readers) over their whole iteration.
+import re           # For turning counter names into valid Prometheus metric names.
+
+try:
+    import fcntl    # For cross-process file locks (POSIX only; without it saves are not serialized).
+except ImportError:
+    fcntl = None
+
+try:
+    import numpy as np  # Optional: backs the columnar student store (CheckMyGradeApp(columnar=True)).
+except ImportError:
+    np = None
 
 
 # CSV File Constants (exact headers as in your screenshots)
@@ -13,86 +57,793 @@ COURSE_FILE = 'Course.csv'          # File storing course details.
 PROFESSOR_FILE = 'Professor.csv'    # File storing professor details.
 LOGIN_FILE = 'Login.csv'            # File storing user-login details/credentials.
 GRADES_FILE = 'Grades.csv'          # File storing grade definitions.
+JOURNAL_FILE = 'CheckMyGrade.journal'   # Append-only log of mutations not yet compacted into the CSVs.
+
+LOCK_FILE = 'CheckMyGrade.lock'         # flock()ed by journal appends (shared) and save_data() (exclusive).
+VERSIONS_FILE = 'CheckMyGrade.versions' # Per-table version stamps, bumped each time save_data() rewrites a table.
+JOURNAL_GENERATION = 'journal'           # Key in VERSIONS_FILE counting journal truncations.
+
+# Number of journal entries after which the journal is compacted back into the CSV snapshots.
+JOURNAL_COMPACT_THRESHOLD = 1000
+
+# Write-behind mode (CheckMyGradeApp(write_behind=True)): queued mutations are group-committed by a
+# background thread every WRITE_BEHIND_INTERVAL seconds, or as soon as WRITE_BEHIND_BATCH are queued.
+WRITE_BEHIND_INTERVAL = 1.0
+WRITE_BEHIND_BATCH = 256
+
+# save_csv keeps the version it replaces as <file>.bak, restored automatically if a CSV is found damaged.
+CSV_BACKUP_SUFFIX = '.bak'
+CSV_CORRUPT_SUFFIX = '.corrupt'   # A damaged CSV is moved aside to <file>.corrupt before the backup is restored.
+ROTATE_CSV_BACKUPS = True
+
+# CSV files at least this large are parsed in chunks by PARALLEL_CSV_WORKERS processes (None: one per core).
+PARALLEL_CSV_MIN_BYTES = 32 * 1024 * 1024
+PARALLEL_CSV_WORKERS = None
+PARALLEL_CSV_CHUNKS_PER_WORKER = 4   # More chunks than workers, so one slow chunk does not hold up the rest.
+
+# Binary snapshot kept next to each CSV (e.g. Student.csv.snapshot) so startup can skip CSV parsing.
+SNAPSHOT_SUFFIX = '.snapshot'
+SNAPSHOT_MAGIC = b'CMGSNAP3'
+SNAPSHOT_CHUNK_ROWS = 10000   # Rows per chunk, so a snapshot is written without holding every row.
+USE_SNAPSHOTS = True
+
+# Database file used by the SQLite storage backend (see SqliteStorage).
+DATABASE_FILE = 'CheckMyGrade.db'
+
+STUDENT_HEADERS = ["Email_address", "First_name", "Last_name", "Course.id", "grades", "Marks"]
+COURSE_HEADERS = ["Course_id", "Course_name", "Description"]
+PROFESSOR_HEADERS = ["Professor_id", "Professor Name", "Rank", "Course.id"]
+LOGIN_HEADERS = ["User_id", "Password", "Role"]
+GRADES_HEADERS = ["Grade_id", "Grade", "Marks_range"]
+
+# Journal table name -> (CSV file, headers, primary-key column, CheckMyGradeApp primary-key index attribute).
+TABLES = {
+    "student": (STUDENT_FILE, STUDENT_HEADERS, "Email_address", "student_index"),
+    "course": (COURSE_FILE, COURSE_HEADERS, "Course_id", "course_index"),
+    "professor": (PROFESSOR_FILE, PROFESSOR_HEADERS, "Professor_id", "professor_index"),
+    "login": (LOGIN_FILE, LOGIN_HEADERS, "User_id", "login_index"),
+    "grades": (GRADES_FILE, GRADES_HEADERS, "Grade_id", "grade_index"),
+}
+
+
+# Metrics (counters and latency histograms)
+# ============================================================
+# Operations wrapped in @timed record their latency into METRICS, which also holds plain counters
+# (such as errors). Disabled by default: a timed call then costs one attribute check. Enable with
+# METRICS.enabled = True (or the CLI's metrics option); dump with to_json() or to_prometheus().
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)  # Upper bounds, seconds.
+
+class LatencyHistogram:
+    """Call count, total seconds and per-bucket counts of one operation's latencies."""
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # The last bucket is +Inf.
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+class MetricsRegistry:
+    """In-process registry of named counters and latency histograms, safe to update from many threads."""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.counters = {}    # Name -> value.
+        self.histograms = {}  # Operation name -> LatencyHistogram.
+        self.lock = threading.Lock()
+
+    def inc(self, name, value=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """Times the body of a with-statement as operation `name` (when enabled)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def to_json(self):
+        """Returns the metrics as a JSON-ready dict; latencies in seconds."""
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "operations": {name: {"count": h.count, "sum": h.sum, "mean": h.sum / h.count if h.count else 0.0,
+                                      "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"],
+                                                          h.bucket_counts))}
+                               for name, h in self.histograms.items()}
+            }
+
+    def to_prometheus(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                # Metric names may only use [a-zA-Z0-9_:]; ":" is reserved for recording rules.
+                name = re.sub(r'[^a-zA-Z0-9_]', '_', name)
+                lines += [f"# TYPE checkmygrade_{name}_total counter", f"checkmygrade_{name}_total {value}"]
+            if self.histograms:
+                lines += ["# HELP checkmygrade_operation_seconds Latency of CheckMyGrade operations.",
+                          "# TYPE checkmygrade_operation_seconds histogram"]
+            for name, h in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], h.bucket_counts):
+                    cumulative += count
+                    lines.append(f'checkmygrade_operation_seconds_bucket{{op="{name}",le="{bound}"}} {cumulative}')
+                lines += [f'checkmygrade_operation_seconds_sum{{op="{name}"}} {h.sum}',
+                          f'checkmygrade_operation_seconds_count{{op="{name}"}} {h.count}']
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+
+def timed(func):
+    """
+    Records each call's latency (and exceptions, as <name>_errors) in METRICS when metrics are enabled.
+    A generator function is timed from the call until its generator is exhausted or closed, which
+    includes the time the caller spends on each item.
+    """
+    name = func.__name__
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return func(*args, **kwargs)
+            return timed_iteration(func(*args, **kwargs))
+
+        def timed_iteration(gen):
+            start = time.perf_counter()
+            try:
+                yield from gen
+            except Exception:
+                METRICS.inc(f"{name}_errors")
+                raise
+            finally:
+                METRICS.observe(name, time.perf_counter() - start)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not METRICS.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            METRICS.inc(f"{name}_errors")
+            raise
+        finally:
+            METRICS.observe(name, time.perf_counter() - start)
+    return wrapper
 
 
 # CSV Load/Save Utilities
 # ============================                     
-def load_csv(file, headers):
-    data = []
+def iter_csv(file, headers):
+    """Yields the rows of a CSV one at a time, so callers can build entities without holding every row."""
     if os.path.exists(file):
         with open(file, mode='r', newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                data.append(row)
+            yield from csv.DictReader(f)
     else:
         with open(file, mode='w', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=headers)
             writer.writeheader()
-    return data
 
-def save_csv(file, data, headers):
-    with open(file, mode='w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        for row in data:
-            writer.writerow(row)
+def load_csv(file, headers):
+    return list(read_csv_rows(file, headers))
+
+def csv_is_empty(file, headers):
+    """True when the CSV has no data rows; reads at most the header and the first row."""
+    rows = iter_csv(file, headers)
+    first = next(rows, None)
+    rows.close()
+    return first is None
+
+@timed
+def save_csv(file, data, headers, rotate=None):
+    """
+    Atomically replaces `file` with the rows (dicts keyed by `headers`): they are written to a temp file,
+    fsynced and renamed over the target, then the directory is fsynced, so a crash at any point leaves
+    the old or the new file, never a truncated one. With rotation (ROTATE_CSV_BACKUPS unless `rotate`
+    says otherwise) the replaced version is kept as <file>.bak.
+    """
+    rotate = ROTATE_CSV_BACKUPS if rotate is None else rotate
+    tmp_file = f"{file}.{os.getpid()}.tmp"  # Per process, so concurrent writers never rename each other's temp file.
+    with open(tmp_file, mode='w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        # Same output as csv.DictWriter, without its per-row check for unexpected keys.
+        if len(headers) > 1:
+            writer.writerows(map(operator.itemgetter(*headers), data))
+        else:
+            writer.writerows([row[headers[0]]] for row in data)
+        f.flush()
+        os.fsync(f.fileno())
+    if rotate and os.path.exists(file):
+        # The backup is swapped in atomically too; a hard link avoids copying the old file.
+        backup = file + CSV_BACKUP_SUFFIX
+        tmp_backup = f"{backup}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_backup):
+            os.remove(tmp_backup)
+        try:
+            os.link(file, tmp_backup)
+        except OSError:
+            shutil.copy2(file, tmp_backup)
+        os.replace(tmp_backup, backup)
+    os.replace(tmp_file, file)
+    fsync_directory(file)
+
+def fsync_directory(path):
+    """Makes a rename in the directory holding `path` durable (skipped where directories cannot be opened)."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def csv_intact(file, headers, tail_bytes=1 << 16):
+    """
+    Fast integrity check (two small reads): the header row has every expected column and the last
+    record parses into a full row. A file failing it was truncated mid-record or lost its header;
+    hand edits such as a missing final line break still pass.
+    """
+    with open(file, mode='rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8', 'replace')]), [])
+        if not set(headers) <= set(header):
+            return False
+        size = f.seek(0, os.SEEK_END)
+        start = max(size - tail_bytes, 0)
+        f.seek(start)
+        tail = f.read().decode('utf-8', 'replace')
+    tail = tail[:-2] if tail.endswith("\r\n") else tail[:-1] if tail.endswith("\n") else tail
+    # The last record starts after one of the tail's line breaks (it may span several lines if quoted).
+    pos = len(tail)
+    while True:
+        pos = tail.rfind("\n", 0, pos)
+        if pos < 0 and start > 0:
+            return True  # Last record longer than the tail read; not checked.
+        try:
+            rows = list(csv.reader([tail[pos + 1:]], strict=True))
+        except csv.Error:
+            rows = []  # Starts inside a quoted field, or the record was torn inside one.
+        if len(rows) == 1 and len(rows[0]) == len(header):
+            return True
+        if len(rows) > 1 or pos < 0:
+            return False  # The last record alone does not parse into a full row.
+
+def check_csv(file, headers):
+    """
+    Integrity-checks an existing CSV, restoring a damaged one from its intact .bak.
+    Returns False when the file is damaged and could not be restored; it is then left untouched.
+    """
+    if not os.path.exists(file) or csv_intact(file, headers):
+        return True
+    backup = file + CSV_BACKUP_SUFFIX
+    if os.path.exists(backup) and csv_intact(backup, headers):
+        # The damaged file is kept, never overwritten: it may hold edits newer than the backup.
+        corrupt = file + CSV_CORRUPT_SUFFIX
+        n = 1
+        while os.path.exists(corrupt):
+            corrupt = f"{file}{CSV_CORRUPT_SUFFIX}.{n}"
+            n += 1
+        os.replace(file, corrupt)
+        tmp_file = f"{file}.{os.getpid()}.tmp"
+        shutil.copy2(backup, tmp_file)
+        os.replace(tmp_file, file)
+        fsync_directory(file)
+        print(f"{file} failed its integrity check; moved it to {corrupt} and restored the previous version from {backup}.")
+        return True
+    print(f"{file} failed its integrity check and has no intact backup; it was left as is.")
+    return False
+
+def benchmark_save_csv(rows=1_000_000, file='bench_Student.csv'):
+    """Times the old in-place csv.DictWriter writer against save_csv on `rows` generated student rows."""
+    def student_rows():
+        for i in range(rows):
+            yield {"Email_address": f"student{i}@example.com", "First_name": f"First{i}", "Last_name": f"Last{i}",
+                   "Course.id": f"CS{i % 50}", "grades": "ABCDF"[i % 5], "Marks": i % 101}
+
+    def save_csv_in_place(file, data, headers):
+        with open(file, mode='w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=headers)
+            writer.writeheader()
+            for row in data:
+                writer.writerow(row)
+
+    results = {}
+    for name, writer in (("in-place DictWriter", save_csv_in_place), ("atomic save_csv", save_csv)):
+        start = time.perf_counter()
+        writer(file, student_rows(), STUDENT_HEADERS)
+        results[name] = time.perf_counter() - start
+        print(f"{name}: {results[name]:.2f} s ({rows / results[name]:,.0f} rows/s)")
+    for path in (file, file + CSV_BACKUP_SUFFIX):
+        if os.path.exists(path):
+            os.remove(path)
+    return results
+
+
+# Parallel CSV Parsing (large files)
+# ============================================================
+# A large CSV is cut into byte ranges that each start at a record boundary and parsed by a pool of
+# processes; the parent merges the chunks back in file order. A newline is a record boundary only when
+# an even number of quote characters precede it (csv.writer quotes any field containing a quote, and
+# an escaped quote is doubled), so a quoted field with embedded newlines is never split.
+def count_quotes(data, start, end, block=1 << 24):
+    """Number of b'"' in data[start:end], counted a block at a time to bound the copies."""
+    return sum(data[pos:min(pos + block, end)].count(b'"') for pos in range(start, end, block))
+
+def csv_record_boundaries(file, parts):
+    """Returns byte offsets [0, ..., file size] splitting the file into up to `parts` ranges of whole records."""
+    size = os.path.getsize(file)
+    bounds = [0]
+    with open(file, mode='rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        pos = 0
+        quotes = 0  # Quote characters in data[:pos].
+        for part in range(1, parts):
+            target = size * part // parts
+            if target <= pos:
+                continue
+            quotes += count_quotes(data, pos, target)
+            pos = target
+            # Move on to just past the next newline that is outside quotes.
+            while pos < size:
+                newline = data.find(b'\n', pos)
+                end = size if newline < 0 else newline + 1
+                quotes += count_quotes(data, pos, end)
+                pos = end
+                if quotes % 2 == 0:
+                    break
+            if pos >= size:
+                break
+            bounds.append(pos)
+    bounds.append(size)
+    return bounds
+
+@contextlib.contextmanager
+def gc_paused():
+    """
+    Suspends the cyclic garbage collector: building millions of rows (all acyclic) otherwise
+    triggers full collections that cost more than the parsing itself.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def parse_csv_chunk(file, start, end):
+    """
+    Worker: parses the records in file[start:end] into lists of values, skipping blank lines, and
+    returns them pickled without a memo (fast mode), which is several times quicker for flat rows.
+    """
+    with open(file, mode='rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    with gc_paused():
+        # Decoded as open() would in iter_csv (the locale's encoding).
+        rows = [row for row in csv.reader(io.TextIOWrapper(io.BytesIO(data), newline='')) if row]
+        out = io.BytesIO()
+        pickler = pickle.Pickler(out, pickle.HIGHEST_PROTOCOL)
+        pickler.fast = True
+        pickler.dump(rows)
+    return out.getvalue()
+
+def iter_csv_parallel(file, workers):
+    """
+    Yields the rows of a CSV as dicts keyed by its header, like csv.DictReader, with the chunks parsed in
+    `workers` processes. Rows come out in file order, each chunk as soon as it and those before it are parsed.
+    """
+    bounds = csv_record_boundaries(file, workers * PARALLEL_CSV_CHUNKS_PER_WORKER)
+    # Forking while the flusher or service threads hold locks could copy them into the workers locked,
+    # so the workers come from a fork server (or are spawned where there is none).
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        fieldnames = None
+        for chunk in pool.map(parse_csv_chunk, repeat(file), bounds[:-1], bounds[1:]):
+            with gc_paused():
+                rows = pickle.loads(chunk)
+            del chunk
+            for values in rows:
+                if fieldnames is None:
+                    fieldnames = values
+                    width = len(fieldnames)
+                    continue
+                row = dict(zip(fieldnames, values))
+                # Short and long rows are filled in the way DictReader does it.
+                if len(values) < width:
+                    row.update(dict.fromkeys(fieldnames[len(values):]))
+                elif len(values) > width:
+                    row[None] = values[width:]
+                yield row
+
+@timed
+def read_csv_rows(file, headers, workers=None, min_bytes=None):
+    """
+    Yields a CSV's rows as dicts: parsed in parallel (iter_csv_parallel) when the file is at least
+    min_bytes (PARALLEL_CSV_MIN_BYTES) and more than one worker is available, else serially by iter_csv.
+    """
+    workers = workers or PARALLEL_CSV_WORKERS or os.cpu_count() or 1
+    min_bytes = PARALLEL_CSV_MIN_BYTES if min_bytes is None else min_bytes
+    if workers < 2 or not os.path.exists(file) or os.path.getsize(file) < min_bytes:
+        yield from iter_csv(file, headers)
+        return
+    produced = 0
+    try:
+        for row in iter_csv_parallel(file, workers):
+            yield row
+            produced += 1
+    except (OSError, BrokenProcessPool) as e:
+        if produced:
+            raise
+        print(f"Parallel CSV parsing unavailable ({e}); reading {file} serially.")
+        yield from iter_csv(file, headers)
+
+
+# Binary Snapshots of the CSV Files
+# ============================================================
+# Layout: SNAPSHOT_MAGIC, chunks of at most SNAPSHOT_CHUNK_ROWS rows, then a JSON trailer (CSV size, mtime, SHA-256 and headers) and its uint32 length. The trailer comes
+# last so rows can be streamed out while the CSV is still being read or written. A chunk is two uint32s
+# (row count, byte length) and the UTF-8 text of its fields in header order, separated by NUL: plain
+# data, never unpickled, since anyone able to write the data directory could forge it. Tables with a NUL
+# in some field just get no snapshot. The file is read
+# through mmap, so worker processes loading the same snapshot share its pages in the OS page cache.
+def file_sha256(file):
+    digest = hashlib.sha256()
+    with open(file, mode='rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class SnapshotWriter:
+    """
+    Streams the rows (tuples of CSV strings in header order) of `file` into a snapshot temp file;
+    finish() stamps it with the CSV's current version and renames it into place. Snapshots are only a
+    cache, so writing is best-effort: any error discards the temp file and the CSV is used as before.
+    """
+    def __init__(self, file, headers):
+        self.file = file
+        self.headers = headers
+        self.tmp_file = f"{file}{SNAPSHOT_SUFFIX}.{os.getpid()}.tmp"  # Per process: readers may write snapshots concurrently.
+        self.chunk = []
+        try:
+            self.out = open(self.tmp_file, mode='wb')
+            self.out.write(SNAPSHOT_MAGIC)
+        except OSError:
+            self.discard()
+
+    def add(self, row):
+        if self.out is None:
+            return
+        self.chunk.append(row)
+        if len(self.chunk) >= SNAPSHOT_CHUNK_ROWS:
+            self.write_chunk()
+
+    def write_chunk(self):
+        fields = [value for row in self.chunk for value in row]
+        try:
+            text = "\0".join(fields)
+            if text.count("\0") != len(fields) - 1:
+                raise ValueError("a field contains NUL")
+            data = text.encode('utf-8')
+            self.out.write(struct.pack('<II', len(self.chunk), len(data)) + data)
+        except (OSError, ValueError, TypeError):  # TypeError: a short CSV row left a None field.
+            self.discard()
+        self.chunk = []
+
+    def finish(self):
+        if self.out is None:
+            return
+        if self.chunk:
+            self.write_chunk()
+            if self.out is None:
+                return
+        try:
+            stat = os.stat(self.file)
+            trailer = json.dumps({"csv_size": stat.st_size, "csv_mtime_ns": stat.st_mtime_ns,
+                                  "csv_sha256": file_sha256(self.file), "headers": self.headers}).encode('utf-8')
+            self.out.write(trailer + struct.pack('<I', len(trailer)))
+            self.out.close()
+            self.out = None
+            os.replace(self.tmp_file, self.file + SNAPSHOT_SUFFIX)
+        except OSError:
+            self.discard()
+
+    def discard(self):
+        """Drops the snapshot being written; a no-op once it has been finished or discarded."""
+        out, self.out = getattr(self, 'out', None), None
+        self.chunk = []
+        try:
+            if out is not None:
+                out.close()
+            if os.path.exists(self.tmp_file):
+                os.remove(self.tmp_file)
+        except OSError:
+            pass
+
+def load_snapshot(file, headers):
+    """
+    Returns the rows stored in the snapshot of `file`, or None when the snapshot is missing,
+    unreadable or stale (the CSV's size, mtime or SHA-256 no longer match).
+    """
+    snapshot = file + SNAPSHOT_SUFFIX
+    if not os.path.exists(snapshot) or not os.path.exists(file):
+        return None
+    try:
+        with open(snapshot, mode='rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                return None
+            (trailer_len,) = struct.unpack_from('<I', mm, len(mm) - 4)
+            payload_end = len(mm) - 4 - trailer_len
+            if payload_end < len(SNAPSHOT_MAGIC):
+                return None
+            trailer = json.loads(mm[payload_end:len(mm) - 4])
+            stat = os.stat(file)
+            if (trailer["csv_size"] != stat.st_size or trailer["csv_mtime_ns"] != stat.st_mtime_ns
+                    or trailer["headers"] != headers or trailer["csv_sha256"] != file_sha256(file)):
+                return None
+            rows = []
+            width = len(headers)
+            pos = len(SNAPSHOT_MAGIC)
+            while pos < payload_end:
+                count, size = struct.unpack_from('<II', mm, pos)
+                pos += 8
+                if pos + size > payload_end:
+                    return None
+                fields = mm[pos:pos + size].decode('utf-8').split("\0")
+                pos += size
+                if len(fields) != count * width:
+                    return None
+                rows.extend(zip(*[iter(fields)] * width))
+            return rows if pos == payload_end else None
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+
+
+def same_file_version(a, b):
+    """True when two os.stat() results describe the same, unmodified file."""
+    return (a.st_ino, a.st_size, a.st_mtime_ns) == (b.st_ino, b.st_size, b.st_mtime_ns)
+
+
+# Cross-Process Locking & Table Versions
+# ============================================================
+# Several processes may share the CSV files. Journal appends hold a shared lock and save_data()
+# holds an exclusive one, so a save never truncates an entry it has not folded into the CSVs.
+# Readers take no lock (see CheckMyGradeApp.load_table). Every save bumps the version stamp of
+# each table it rewrites; a session whose copy of a table is older merges before saving.
+@contextlib.contextmanager
+def file_lock(exclusive=True):
+    with open(LOCK_FILE, mode='a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield  # Closing the file releases the lock.
+
+def read_versions():
+    """Returns {table: version} as last saved; tables never saved are absent (version 0)."""
+    try:
+        with open(VERSIONS_FILE, mode='r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_versions(versions):
+    tmp_file = VERSIONS_FILE + '.tmp'
+    with open(tmp_file, mode='w') as f:
+        json.dump(versions, f)
+    os.replace(tmp_file, VERSIONS_FILE)
+
+def journal_size():
+    return os.path.getsize(JOURNAL_FILE) if os.path.exists(JOURNAL_FILE) else 0
 
 
 # Initialize CSVs with Sample Rows
 # ============================================================
+# Rows written into a table when it has no data yet. Grades stays empty unless new grades are added.
+SAMPLE_ROWS = {
+    "student": {
+        "Email_address": "sam@mycsu.edu",
+        "First_name": "Sam",
+        "Last_name": "Carpenter",
+        "Course.id": "DATA200",
+        "grades": "A",
+        "Marks": "96"
+    },
+    "course": {
+        "Course_id": "DATA200",
+        "Course_name": "Data Science",
+        "Description": "Provides insight about DS and Python"
+    },
+    "professor": {
+        "Professor_id": "micheal@mycsu.edu",
+        "Professor Name": "Micheal John",
+        "Rank": "Senior Professor",
+        "Course.id": "DATA200"
+    },
+    "login": {
+        "User_id": "micheal@mycsu.edu",
+        "Password": "AQ10134",  # Sample row stored as plain text.
+        "Role": "professor"
+    },
+}
+
 def initialize_csv_if_empty():
-    # Student.csv
-    student_headers = ["Email_address", "First_name", "Last_name", "Course.id", "grades", "Marks"]
-    if len(load_csv(STUDENT_FILE, student_headers)) == 0:
-        with open(STUDENT_FILE, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=student_headers)
-            writer.writeheader()
-            writer.writerow({
-                "Email_address": "sam@mycsu.edu",
-                "First_name": "Sam",
-                "Last_name": "Carpenter",
-                "Course.id": "DATA200",
-                "grades": "A",
-                "Marks": "96"
-            })
-
-    # Course.csv – three fields: Course_id, Course_name, Description.
-    course_headers = ["Course_id", "Course_name", "Description"]
-    if len(load_csv(COURSE_FILE, course_headers)) == 0:
-        with open(COURSE_FILE, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=course_headers)
-            writer.writeheader()
-            writer.writerow({
-                "Course_id": "DATA200",
-                "Course_name": "Data Science",
-                "Description": "Provides insight about DS and Python"
-            })
-
-    # Professor.csv
-    prof_headers = ["Professor_id", "Professor Name", "Rank", "Course.id"]
-    if len(load_csv(PROFESSOR_FILE, prof_headers)) == 0:
-        with open(PROFESSOR_FILE, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=prof_headers)
-            writer.writeheader()
-            writer.writerow({
-                "Professor_id": "micheal@mycsu.edu",
-                "Professor Name": "Micheal John",
-                "Rank": "Senior Professor",
-                "Course.id": "DATA200"
-            })
-
-    # Login.csv
-    login_headers = ["User_id", "Password", "Role"]
-    if len(load_csv(LOGIN_FILE, login_headers)) == 0:
-        with open(LOGIN_FILE, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=login_headers)
-            writer.writeheader()
-            writer.writerow({
-                "User_id": "micheal@mycsu.edu",
-                "Password": "AQ10134",  # Sample row stored as plain text.
-                "Role": "professor"
-            })
-    # Grades.csv remains empty unless new grades are added.
+    # Under the cross-process lock, so sessions starting together check and seed each file once.
+    with file_lock():
+        for table, (file, headers, _, _) in TABLES.items():
+            # A damaged file is restored from its backup or left alone, never reseeded over.
+            if check_csv(file, headers) and table in SAMPLE_ROWS and csv_is_empty(file, headers):
+                save_csv(file, [SAMPLE_ROWS[table]], headers)
+
+
+# Storage Backends
+# ============================================================
+# CheckMyGradeApp reads and writes table rows (dicts keyed by the TABLES headers) through a
+# storage backend. CsvStorage is the original one-CSV-per-table layout: mutations go to the
+# write-ahead journal and save_data() compacts them into the CSVs. SqliteStorage keeps every
+# table in one SQLite file and commits each mutation as it happens, so it needs no journal.
+class CsvStorage:
+    journaled = True
+
+    def initialize(self):
+        initialize_csv_if_empty()
+
+    def load_rows(self, table):
+        """Yields a table's rows from its binary snapshot when fresh, else from the CSV (refreshing the snapshot)."""
+        file, headers = TABLES[table][:2]
+        rows = load_snapshot(file, headers) if USE_SNAPSHOTS else None
+        if rows is not None:
+            for values in rows:
+                yield dict(zip(headers, values))
+            return
+        before = os.stat(file) if os.path.exists(file) else None
+        if not USE_SNAPSHOTS or before is None:
+            yield from read_csv_rows(file, headers)
+            return
+        snapshot = SnapshotWriter(file, headers)
+        try:
+            for row in read_csv_rows(file, headers):
+                yield row
+                snapshot.add(tuple(row[h] for h in headers))
+            # Skip the snapshot if another process replaced the CSV while it was being read.
+            if same_file_version(before, os.stat(file)):
+                snapshot.finish()
+        finally:
+            snapshot.discard()
+
+    def save_table(self, table, rows):
+        """Rewrites a table's CSV (and its snapshot) with the given rows, streaming them to both."""
+        file, headers = TABLES[table][:2]
+        if not USE_SNAPSHOTS:
+            save_csv(file, rows, headers)
+            return
+        snapshot = SnapshotWriter(file, headers)
+
+        def tee(rows):
+            for row in rows:
+                snapshot.add(tuple(str(row[h]) for h in headers))
+                yield row
+        try:
+            save_csv(file, tee(rows), headers)
+            snapshot.finish()
+        finally:
+            snapshot.discard()
+
+    def close(self):
+        pass
+
+class SqliteStorage:
+    """
+    One SQLite table per CSV table, with the CSV headers as columns, the TABLES primary key as
+    PRIMARY KEY and an index on Course.id. Rows come back in insertion order, as from the CSVs.
+    """
+    journaled = False
+
+    def __init__(self, path=DATABASE_FILE):
+        self.path = path
+        # Shared by the app's threads; CheckMyGradeApp's write lock serializes its use.
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+
+    @staticmethod
+    def quote(name):
+        # Headers such as "Course.id" and "Professor Name" need quoting as SQL identifiers.
+        return '"' + name.replace('"', '""') + '"'
+
+    def columns(self, table):
+        return ", ".join(self.quote(h) for h in TABLES[table][1])
+
+    def initialize(self):
+        """Creates missing tables and indexes, then writes the sample rows into empty tables."""
+        with self.conn:
+            for table, (_, headers, key, _) in TABLES.items():
+                columns = []
+                for h in headers:
+                    column_type = "NUMERIC" if h == "Marks" else "TEXT"
+                    columns.append(f"{self.quote(h)} {column_type}" + (" PRIMARY KEY NOT NULL" if h == key else ""))
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)})")
+                if "Course.id" in headers:
+                    self.conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_course_id ON {table} ("Course.id")')
+        for table, row in SAMPLE_ROWS.items():
+            if self.conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None:
+                self.save_table(table, [row])
+
+    def load_rows(self, table):
+        headers = TABLES[table][1]
+        for values in self.conn.execute(f"SELECT {self.columns(table)} FROM {table} ORDER BY rowid"):
+            yield dict(zip(headers, values))
+
+    def save_table(self, table, rows):
+        """Replaces every row of a table in one transaction."""
+        headers = TABLES[table][1]
+        placeholders = ", ".join("?" for _ in headers)
+        with self.conn:
+            self.conn.execute(f"DELETE FROM {table}")
+            self.conn.executemany(f"INSERT OR REPLACE INTO {table} ({self.columns(table)}) VALUES ({placeholders})",
+                                  (tuple(row[h] for h in headers) for row in rows))
+
+    def apply(self, entries):
+        """
+        Commits journal-style entries ({"table", "op": "put"/"delete", "key", "row"}) in one transaction.
+        A put inserts or updates the row; an updated row keeps its position.
+        """
+        with self.conn:
+            for entry in entries:
+                table = entry["table"]
+                headers, key_column = TABLES[table][1], TABLES[table][2]
+                if entry["op"] == "delete":
+                    self.conn.execute(f"DELETE FROM {table} WHERE {self.quote(key_column)} = ?", (entry["key"],))
+                    continue
+                placeholders = ", ".join("?" for _ in headers)
+                updates = ", ".join(f"{self.quote(h)} = excluded.{self.quote(h)}" for h in headers if h != key_column)
+                self.conn.execute(f"INSERT INTO {table} ({self.columns(table)}) VALUES ({placeholders}) "
+                                  f"ON CONFLICT({self.quote(key_column)}) DO UPDATE SET {updates}",
+                                  tuple(entry["row"][h] for h in headers))
+
+    def close(self):
+        self.conn.close()
+
+def migrate_csv_to_sqlite(db_file=DATABASE_FILE):
+    """One-shot copy of every CSV table into a SQLite database; pending journal entries are compacted first."""
+    CheckMyGradeApp().save_data()
+    storage = SqliteStorage(db_file)
+    storage.initialize()
+    counts = {}
+    for table, (file, headers, _, _) in TABLES.items():
+        rows = load_csv(file, headers)
+        storage.save_table(table, rows)
+        counts[table] = len(rows)
+        print(f"Migrated {len(rows)} {table} rows into {db_file}.")
+    storage.close()
+    return counts
 
 
 # Populate 100 Dummy Student Records
@@ -107,33 +858,142 @@ def populate_dummy_students(app):
     if num_to_add <= 0:
         print("Student file already has 100 or more dummy records.")
         return
+    rows = []
     for i in range(num_to_add):
-        first = f"DummyFirst{i}"
-        last = f"DummyLast{i}"
-        email = f"dummy{i}@example.com"
-        course = "CS101"  # Default dummy course.
-        grade = "A"
-        marks = str(70 + (i % 30))  # Marks between 70 and 99.
-        app.add_student(first, last, email, course, grade, marks)
+        rows.append({
+            "First_name": f"DummyFirst{i}",
+            "Last_name": f"DummyLast{i}",
+            "Email_address": f"dummy{i}@example.com",
+            "Course.id": "CS101",  # Default dummy course.
+            "grades": "A",
+            "Marks": str(70 + (i % 30))  # Marks between 70 and 99.
+        })
+    app.add_students_bulk(rows)
     print("100 dummy student records have been populated.")
 
 
+# Bulk Import of Students from a CSV File
+# ============================================================
+def import_students_from_csv(app, file):
+    """Imports every row of a Student.csv-formatted file and prints the per-row error report."""
+    if not os.path.exists(file):
+        print(f"File not found: {file}")
+        return 0, []
+    with open(file, mode='r', newline='') as f:
+        added, errors = app.add_students_bulk(csv.DictReader(f))
+    print(f"Imported {added} student records, rejected {len(errors)}.")
+    for row_no, email, reason in errors:
+        print(f"   Row {row_no}: {email or '<no email>'} - {reason}")
+    return added, errors
+
+
+# Password Hashing & Login Cache
+# ============================================================
+# Passwords are stored as salted PBKDF2-SHA256 verifiers: "pbkdf2_sha256$<iterations>$<salt>$<hash>".
+PASSWORD_HASH_ALGORITHM = 'pbkdf2_sha256'
+PASSWORD_HASH_ITERATIONS = 600_000   # Cost of hashing; verifiers made with fewer are re-hashed at their next login.
+LOGIN_CACHE_SIZE = 1024              # Recent successful logins remembered by CredentialCache...
+LOGIN_CACHE_TTL = 300.0              # ...for this many seconds.
+
+def hash_password(password, iterations=None):
+    """Returns a new salted verifier for a plain-text password."""
+    iterations = iterations or PASSWORD_HASH_ITERATIONS
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return (f"{PASSWORD_HASH_ALGORITHM}${iterations}$"
+            f"{base64.b64encode(salt).decode('ascii')}${base64.b64encode(digest).decode('ascii')}")
+
+def parse_verifier(verifier):
+    """Returns (iterations, salt, hash) of a verifier, or None if it is a legacy (pre-hashing) value."""
+    parts = verifier.split('$')
+    if len(parts) != 4 or parts[0] != PASSWORD_HASH_ALGORITHM:
+        return None
+    try:
+        return int(parts[1]), base64.b64decode(parts[2]), base64.b64decode(parts[3])
+    except ValueError:
+        return None
+
+def check_password(verifier, password):
+    """Re-derives the hash of `password` with the verifier's salt and cost and compares in constant time."""
+    parsed = parse_verifier(verifier)
+    if parsed is None:
+        return False
+    iterations, salt, expected = parsed
+    return hmac.compare_digest(hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations), expected)
+
+class CredentialCache:
+    """
+    Bounded LRU of recent successful logins, each valid for `ttl` seconds, so repeated logins skip the
+    deliberately slow hash. An entry keeps an HMAC of the password under a per-process random key, never
+    the password, plus the verifier it was checked against, so a changed password misses the cache.
+    """
+    def __init__(self, maxsize=LOGIN_CACHE_SIZE, ttl=LOGIN_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()  # User_id -> (expiry time, verifier, password MAC), least recent first.
+        self.key = os.urandom(32)
+        self.lock = threading.Lock()  # Logins are validated concurrently.
+
+    def mac(self, password):
+        return hmac.new(self.key, password.encode('utf-8'), 'sha256').digest()
+
+    def check(self, user_id, verifier, password):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return False
+            expiry, cached_verifier, mac = entry
+            if expiry < time.monotonic() or cached_verifier != verifier:
+                del self.entries[user_id]
+                return False
+            self.entries.move_to_end(user_id)
+        return hmac.compare_digest(mac, self.mac(password))
+
+    def add(self, user_id, verifier, password):
+        entry = (time.monotonic() + self.ttl, verifier, self.mac(password))
+        with self.lock:
+            self.entries[user_id] = entry
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+
 # Class Definitions
 # ============================================================
+def parse_marks(value):
+    """
+    Parses marks once into a number: an int when whole (so "96" round-trips to the CSV as "96"), else a float.
+    Raises ValueError for anything that is not a finite number.
+    """
+    marks = float(value)
+    if not math.isfinite(marks):
+        raise ValueError(f"invalid marks {value!r}")
+    return int(marks) if marks.is_integer() else marks
+
+def non_string_field(**fields):
+    """Returns the name of the first given field that is neither a string nor None, else None."""
+    for name, value in fields.items():
+        if value is not None and not isinstance(value, str):
+            return name
+    return None
+
 class Student:
+    __slots__ = ("First_name", "Last_name", "Email_address", "Course_id", "grades", "Marks")
+
     def __init__(self, First_name, Last_name, Email_address, Course_id, grades, Marks):
         self.First_name = First_name
         self.Last_name = Last_name
         self.Email_address = Email_address
         self.Course_id = Course_id
         self.grades = grades
-        self.Marks = Marks
+        self.Marks = parse_marks(Marks)   # Stored as a number, never as the CSV string.
 
     def display(self):
-        print(f"{self.First_name} {self.Last_name} | Email: {self.Email_address} | "
-              f"Course: {self.Course_id} | grades: {self.grades} | Marks: {self.Marks}")
+        print(student_line(self.to_dict()))
 
     def update(self, First_name=None, Last_name=None, Course_id=None, grades=None, Marks=None):
+        if Marks is not None:
+            Marks = parse_marks(Marks)    # Validate before changing anything.
         if First_name:
             self.First_name = First_name
         if Last_name:
@@ -155,427 +1015,2136 @@ class Student:
             "Marks": self.Marks
         }
 
+    @classmethod
+    def from_row(cls, row):
+        return cls(row["First_name"], row["Last_name"], row["Email_address"],
+                   row["Course.id"], row["grades"], row["Marks"])
+
 class Course:
     # Only three fields: Course_id, Course_name, Description.
+    __slots__ = ("Course_id", "Course_name", "Description")
+
     def __init__(self, Course_id, Course_name, Description):
         self.Course_id = Course_id
         self.Course_name = Course_name
         self.Description = Description
 
-    def display(self):
-        print(f"Course ID: {self.Course_id} | Name: {self.Course_name} | {self.Description}")
+    def display(self):
+        print(course_line(self.to_dict()))
+
+    def to_dict(self):
+        return {
+            "Course_id": self.Course_id,
+            "Course_name": self.Course_name,
+            "Description": self.Description
+        }
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row["Course_id"], row["Course_name"], row["Description"])
+
+class Professor:
+    __slots__ = ("Professor_id", "Professor_Name", "Rank", "Course_id")
+
+    def __init__(self, Professor_id, Professor_Name, Rank, Course_id):
+        self.Professor_id = Professor_id
+        self.Professor_Name = Professor_Name
+        self.Rank = Rank
+        self.Course_id = Course_id
+
+    def display(self):
+        print(professor_line(self.to_dict()))
+
+    def to_dict(self):
+        return {
+            "Professor_id": self.Professor_id,
+            "Professor Name": self.Professor_Name,
+            "Rank": self.Rank,
+            "Course.id": self.Course_id
+        }
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row["Professor_id"], row["Professor Name"], row["Rank"], row["Course.id"])
+
+class Grades:
+    __slots__ = ("Grade_id", "Grade", "Marks_range")
+
+    def __init__(self, Grade_id, Grade, Marks_range):
+        self.Grade_id = Grade_id
+        self.Grade = Grade
+        self.Marks_range = Marks_range
+
+    def display_grade_report(self):
+        print(grade_line(self.to_dict()))
+
+    def modify_grade(self, Grade=None, Marks_range=None):
+        if Grade:
+            self.Grade = Grade
+        if Marks_range:
+            self.Marks_range = Marks_range
+
+    def to_dict(self):
+        return {
+            "Grade_id": self.Grade_id,
+            "Grade": self.Grade,
+            "Marks_range": self.Marks_range
+        }
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row["Grade_id"], row["Grade"], row["Marks_range"])
+
+class LoginUser:
+    __slots__ = ("User_id", "Password", "Role")
+
+    def __init__(self, User_id, Password, Role):
+        # Only a salted hash of the plain-text password is kept (see hash_password).
+        self.User_id = User_id
+        self.Role = Role
+        self.Password = hash_password(Password)
+
+    def verify_password(self, password):
+        """Constant-time password check; legacy (pre-hashing) Password values are checked as before."""
+        if parse_verifier(self.Password) is not None:
+            return check_password(self.Password, password)
+        legacy = self.legacy_password()
+        return legacy is not None and hmac.compare_digest(legacy.encode('utf-8'), password.encode('utf-8'))
+
+    def needs_rehash(self):
+        """True for legacy Password values and for verifiers made with fewer than PASSWORD_HASH_ITERATIONS."""
+        parsed = parse_verifier(self.Password)
+        return parsed is None or parsed[0] < PASSWORD_HASH_ITERATIONS
+
+    def legacy_password(self):
+        """Plain text behind a legacy Password: base64-encoded, except the sample professor row kept as plain text."""
+        if self.User_id == "micheal@mycsu.edu" and self.Password == "AQ10134" and self.Role == "professor":
+            return self.Password
+        try:
+            return base64.b64decode(self.Password.encode('utf-8'), validate=True).decode('utf-8')
+        except ValueError:
+            return None
+    
+    def to_dict(self):
+        return {
+            "User_id": self.User_id,
+            "Password": self.Password,
+            "Role": self.Role
+        }
+
+    @classmethod
+    def from_row(cls, row):
+        # Rows hold the stored verifier, which must not be hashed again.
+        user = cls.__new__(cls)
+        user.User_id = row["User_id"]
+        user.Password = row["Password"]
+        user.Role = row["Role"]
+        return user
+
+# Journal/CSV table name -> entity class built from its rows.
+ENTITY_CLASSES = {"student": Student, "course": Course, "professor": Professor,
+                  "login": LoginUser, "grades": Grades}
+
+
+# Marks Order Index
+# ============================================================
+class MarksIndex:
+    """
+    Record keys kept sorted by marks, so ordered listings never need a full sort.
+    Entries are (marks, seq, key); seq keeps students with equal marks in insertion order.
+    The entries are a blocked sorted list: sorted blocks of at most 2 * BLOCK_SIZE entries plus the
+    last entry of each block, so add/remove bisect twice and shift one block (O(log n + BLOCK_SIZE)
+    plus O(n / BLOCK_SIZE) when a block splits or empties), instead of shifting the whole list.
+    Running totals make count/mean/std-dev O(1); min/max are O(1) and median/quantiles/rank walk
+    the block lengths, O(n / BLOCK_SIZE).
+    """
+    BLOCK_SIZE = 1000
+
+    def __init__(self):
+        self.blocks = []        # Sorted lists of (marks, seq, key), each sorted after the one before.
+        self.maxes = []         # Last entry of each block.
+        self.count = 0
+        self.sort_keys = {}     # Key -> (marks, seq) of its entry.
+        self.next_seq = 0
+        self.total = 0          # Running sum of marks.
+        self.total_sq = 0       # Running sum of squared marks.
+
+    def __len__(self):
+        return self.count
+
+    def add(self, key, marks):
+        """Inserts a record, or moves it if its marks changed."""
+        old = self.sort_keys.get(key)
+        if old is not None:
+            if old[0] == marks:
+                return
+            self.remove(key)
+            seq = old[1]
+        else:
+            seq = self.next_seq
+            self.next_seq += 1
+        self.insert((marks, seq, key))
+        self.sort_keys[key] = (marks, seq)
+        self.total += marks
+        self.total_sq += marks * marks
+
+    def insert(self, entry):
+        if not self.blocks:
+            self.blocks.append([entry])
+            self.maxes.append(entry)
+            self.count = 1
+            return
+        i = min(bisect.bisect_left(self.maxes, entry), len(self.blocks) - 1)
+        block = self.blocks[i]
+        bisect.insort(block, entry)
+        self.maxes[i] = block[-1]
+        self.count += 1
+        if len(block) > 2 * self.BLOCK_SIZE:
+            self.blocks[i:i + 1] = [block[:self.BLOCK_SIZE], block[self.BLOCK_SIZE:]]
+            self.maxes.insert(i, block[self.BLOCK_SIZE - 1])
+
+    def bulk_load(self, items):
+        """Replaces the contents with (key, marks) pairs, sorting once; O(n log n)."""
+        entries = sorted((marks, seq, key) for seq, (key, marks) in enumerate(items))
+        self.blocks = [entries[i:i + self.BLOCK_SIZE] for i in range(0, len(entries), self.BLOCK_SIZE)]
+        self.maxes = [block[-1] for block in self.blocks]
+        self.count = len(entries)
+        self.sort_keys = {key: (marks, seq) for marks, seq, key in entries}
+        self.next_seq = len(entries)
+        self.total = sum(marks for marks, _, _ in entries)
+        self.total_sq = sum(marks * marks for marks, _, _ in entries)
+
+    def remove(self, key):
+        old = self.sort_keys.pop(key, None)
+        if old is not None:
+            entry = (old[0], old[1], key)
+            i = bisect.bisect_left(self.maxes, entry)
+            block = self.blocks[i]
+            del block[bisect.bisect_left(block, entry)]
+            self.count -= 1
+            if block:
+                self.maxes[i] = block[-1]
+            else:
+                del self.blocks[i]
+                del self.maxes[i]
+            self.total -= old[0]
+            self.total_sq -= old[0] * old[0]
+
+    def entries(self):
+        """Iterates over the (marks, seq, key) entries in order."""
+        return chain.from_iterable(self.blocks)
+
+    def entry_at(self, pos):
+        for block in self.blocks:
+            if pos < len(block):
+                return block[pos]
+            pos -= len(block)
+        raise IndexError(pos)
+
+    def count_below(self, entry):
+        """Number of entries that sort before `entry`."""
+        i = bisect.bisect_left(self.maxes, entry)
+        below = sum(len(block) for block in self.blocks[:i])
+        if i < len(self.blocks):
+            below += bisect.bisect_left(self.blocks[i], entry)
+        return below
+
+    def between(self, low, end):
+        """Returns the keys with low <= marks < end, in marks order; O(log n) to find the range."""
+        keys = []
+        i = bisect.bisect_left(self.maxes, (low,))
+        for block in self.blocks[i:]:
+            for marks, _, key in islice(block, bisect.bisect_left(block, (low,)), None):
+                if marks >= end:
+                    return keys
+                keys.append(key)
+        return keys
+
+    def ascending(self, k=None):
+        """Returns the keys from lowest to highest marks (only the first k when k is given)."""
+        return [key for _, _, key in islice(self.entries(), k)]
+
+    def descending(self, k=None):
+        """Returns the keys from highest to lowest marks; equal marks stay in insertion order."""
+        keys = []
+        backwards = chain.from_iterable(map(reversed, reversed(self.blocks)))
+        for _, group in groupby(backwards, key=operator.itemgetter(0)):
+            if k is not None and len(keys) >= k:
+                break
+            keys.extend(reversed([key for _, _, key in group]))
+        return keys if k is None else keys[:k]
+
+    def rank(self, key):
+        """1-based rank by marks, highest first; equal marks share a rank."""
+        marks = self.sort_keys[key][0]
+        return self.count - self.count_below((marks, math.inf)) + 1
+
+    # Aggregates below assume at least one entry.
+    def mean(self):
+        return self.total / self.count
+
+    def stdev(self):
+        """Population standard deviation of the marks."""
+        mean = self.mean()
+        return math.sqrt(max(self.total_sq / self.count - mean * mean, 0.0))
+
+    def minimum(self):
+        return self.blocks[0][0][0]
+
+    def maximum(self):
+        return self.maxes[-1][0]
+
+    def quantile(self, q):
+        """Marks at quantile q (0 to 1), interpolating linearly between neighbours; quantile(0.5) is the median."""
+        pos = q * (self.count - 1)
+        lo = math.floor(pos)
+        lo_marks = self.entry_at(lo)[0]
+        if lo == pos:
+            return lo_marks
+        return lo_marks + (self.entry_at(lo + 1)[0] - lo_marks) * (pos - lo)
+
+    def median(self):
+        return self.quantile(0.5)
+
+
+# Grade Bands (interval index over Grades.Marks_range)
+# ============================================================
+def parse_marks_range(value):
+    """
+    Parses a Marks_range such as "90-100" into the half-open marks interval it covers, (low, end).
+    A whole-number upper bound reaches up to, not including, the next whole number, so "80-89" and
+    "90-100" leave no hole for 89.5. Raises ValueError for a malformed range.
+    """
+    low, sep, high = value.strip().partition("-")
+    if not sep:
+        raise ValueError(f"invalid marks range {value!r}")
+    low, high = parse_marks(low), parse_marks(high)
+    if low > high:
+        raise ValueError(f"invalid marks range {value!r}")
+    return low, (high + 1 if isinstance(high, int) else math.nextafter(high, math.inf))
+
+class GradeBands:
+    """
+    The grade table as (low, end, Grade_id, Grade) intervals sorted by their lower bound, so the
+    grade for some marks is one binary search. Malformed, overlapping and non-adjacent bands are
+    listed in `problems`; marks below the lowest or above the highest band have no grade.
+    """
+    def __init__(self, grades):
+        self.problems = []
+        bands = []
+        for g in grades:
+            try:
+                low, end = parse_marks_range(g.Marks_range)
+            except ValueError:
+                self.problems.append(f"{g.Grade_id}: invalid marks range {g.Marks_range!r}")
+                continue
+            bands.append((low, end, g.Grade_id, g.Grade))
+        bands.sort()
+        for prev, band in zip(bands, bands[1:]):
+            if band[0] < prev[1]:
+                self.problems.append(f"{prev[2]} and {band[2]} overlap")
+            elif band[0] > prev[1]:
+                self.problems.append(f"gap between {prev[2]} and {band[2]}")
+        self.bands = bands
+        self.starts = [band[0] for band in bands]
+
+    def __len__(self):
+        return len(self.bands)
+
+    def grade_for(self, marks):
+        """Returns the Grade of the band containing marks, or None."""
+        i = bisect.bisect_right(self.starts, marks) - 1
+        if i >= 0 and marks < self.bands[i][1]:
+            return self.bands[i][3]
+        return None
+
+    def intervals(self):
+        return [(low, end) for low, end, _, _ in self.bands]
+
+
+# Columnar Student Store (optional, requires NumPy)
+# ============================================================
+class StudentColumns:
+    """
+    Column-oriented copy of the student table for vectorized analytics: marks as a float64 array,
+    Course_id and grades as integer category codes. Rows of deleted students are reused.
+    """
+    def __init__(self, capacity=1024):
+        self.marks = np.zeros(capacity, dtype=np.float64)
+        self.course_codes = np.zeros(capacity, dtype=np.int32)
+        self.grade_codes = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.rows = {}              # Email_address -> row number.
+        self.free_rows = []         # Rows freed by deletes, reused before growing.
+        self.size = 0               # Rows in use so far (live or freed).
+        self.course_ids = []        # Course code -> Course_id.
+        self.course_lookup = {}     # Course_id -> course code.
+        self.grade_names = []       # Grade code -> grade.
+        self.grade_lookup = {}      # Grade -> grade code.
+
+    @staticmethod
+    def encode(value, names, lookup):
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(names)
+            names.append(value)
+        return code
+
+    def put(self, st):
+        """Inserts or refreshes one student's row."""
+        row = self.rows.get(st.Email_address)
+        if row is None:
+            if self.free_rows:
+                row = self.free_rows.pop()
+            else:
+                if self.size == len(self.marks):
+                    self.grow()
+                row = self.size
+                self.size += 1
+            self.rows[st.Email_address] = row
+        self.marks[row] = st.Marks
+        self.course_codes[row] = self.encode(st.Course_id, self.course_ids, self.course_lookup)
+        self.grade_codes[row] = self.encode(st.grades, self.grade_names, self.grade_lookup)
+        self.alive[row] = True
+
+    def remove(self, email_address):
+        row = self.rows.pop(email_address, None)
+        if row is not None:
+            self.alive[row] = False
+            self.free_rows.append(row)
+
+    def grow(self):
+        capacity = len(self.marks) * 2
+        for name in ("marks", "course_codes", "grade_codes", "alive"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def live(self):
+        """Returns (marks, course codes, grade codes) of live rows."""
+        alive = self.alive[:self.size]
+        return self.marks[:self.size][alive], self.course_codes[:self.size][alive], self.grade_codes[:self.size][alive]
+
+    def course_statistics(self):
+        """Group-by over all courses at once: returns {Course_id: (count, mean, median)}."""
+        marks, courses, _ = self.live()
+        counts = np.bincount(courses, minlength=len(self.course_ids))
+        sums = np.bincount(courses, weights=marks, minlength=len(self.course_ids))
+        # Sorting by (course, marks) lays each course's marks out contiguously and in order.
+        sorted_marks = marks[np.lexsort((marks, courses))]
+        starts = np.cumsum(counts) - counts
+        present = np.nonzero(counts)[0]
+        lo = starts[present] + (counts[present] - 1) // 2
+        hi = starts[present] + counts[present] // 2
+        medians = (sorted_marks[lo] + sorted_marks[hi]) / 2
+        means = sums[present] / counts[present]
+        return {self.course_ids[code]: (int(counts[code]), float(mean), float(median))
+                for code, mean, median in zip(present, means, medians)}
+
+    def grade_histogram(self, course_id=None):
+        """Returns {grade: number of students}, optionally for one course."""
+        _, courses, grades = self.live()
+        if course_id is not None:
+            if course_id not in self.course_lookup:
+                return {}
+            grades = grades[courses == self.course_lookup[course_id]]
+        counts = np.bincount(grades, minlength=len(self.grade_names))
+        return {self.grade_names[code]: int(counts[code]) for code in np.nonzero(counts)[0]}
+
+
+# Trigram Search Index
+# ============================================================
+class TrigramIndex:
+    """
+    Incremental inverted index from 3-character substrings to record keys.
+    Candidate keys for a term are the intersection of its trigram postings, then verified against the text.
+    """
+    START, END = "\x02", "\x03"   # Boundary markers so prefixes and very short fields get trigrams too.
+
+    def __init__(self):
+        self.postings = {}  # Trigram -> set of keys whose text contains it.
+        self.texts = {}     # Key -> tuple of lowercased indexed texts.
+        self.order = {}     # Key -> insertion sequence number, so results keep record order.
+        self.next_seq = 0
+
+    @staticmethod
+    def grams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def add(self, key, texts):
+        """Indexes (or re-indexes) a record; a re-indexed record keeps its original position."""
+        seq = self.order.get(key)
+        self.remove(key)
+        if seq is None:
+            seq = self.next_seq
+            self.next_seq += 1
+        self.order[key] = seq
+        texts = tuple(t.lower() for t in texts)
+        self.texts[key] = texts
+        for gram in set().union(*(self.grams(self.START + t + self.END) for t in texts)):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        texts = self.texts.pop(key, None)
+        if texts is None:
+            return
+        del self.order[key]
+        for gram in set().union(*(self.grams(self.START + t + self.END) for t in texts)):
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def match(self, term, prefix=False):
+        """Returns the keys with a text containing term (or starting with it when prefix=True)."""
+        pattern = self.START + term if prefix else term
+        if len(pattern) >= 3:
+            postings = sorted((self.postings.get(g, set()) for g in self.grams(pattern)), key=len)
+            candidates = set.intersection(*postings)
+        else:
+            # Too short for a trigram: union the postings of every trigram containing the pattern.
+            candidates = set()
+            for gram, keys in self.postings.items():
+                if pattern in gram:
+                    candidates |= keys
+        if prefix:
+            return {k for k in candidates if any(t.startswith(term) for t in self.texts[k])}
+        return {k for k in candidates if any(term in t for t in self.texts[k])}
+
+    def search(self, query, prefix=False):
+        """Returns keys matching every whitespace-separated term of query, in insertion order."""
+        matches = None
+        for term in query.lower().split():
+            found = self.match(term, prefix)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        if matches is None:
+            matches = self.texts   # An empty query matches everything, like the old substring scan.
+        return sorted(matches, key=self.order.__getitem__)
+
+
+# Reader-Writer Lock (thread safety)
+# ============================================================
+class RWLock:
+    """
+    Any number of readers or one writer. Once a writer is waiting, new readers wait behind it so
+    writes are not starved. Re-entrant per thread: nested reads, nested writes and reads inside a
+    write pass straight through; taking the write lock while holding only the read lock is an error.
+    """
+    def __init__(self):
+        self.cond = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writer = None          # Ident of the thread holding the write lock.
+        self.writers_waiting = 0
+        self.local = threading.local()  # Per-thread nesting depth of read and write sections.
+
+    @contextlib.contextmanager
+    def read(self):
+        depth = getattr(self.local, "reads", 0)
+        nested = depth > 0 or self.writer == threading.get_ident()
+        if not nested:
+            with self.cond:
+                while self.writer is not None or self.writers_waiting:
+                    self.cond.wait()
+                self.readers += 1
+        self.local.reads = depth + 1
+        try:
+            yield
+        finally:
+            self.local.reads = depth
+            if not nested:
+                with self.cond:
+                    self.readers -= 1
+                    if not self.readers:
+                        self.cond.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        me = threading.get_ident()
+        if self.writer == me:
+            yield
+            return
+        if getattr(self.local, "reads", 0):
+            raise RuntimeError("cannot take the write lock while holding the read lock")
+        with self.cond:
+            self.writers_waiting += 1
+            while self.writer is not None or self.readers:
+                self.cond.wait()
+            self.writers_waiting -= 1
+            self.writer = me
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.writer = None
+                self.cond.notify_all()
+
+def read_locked(method):
+    """Runs a CheckMyGradeApp method under its read lock, concurrently with other readers."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.rwlock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def write_locked(method):
+    """Runs a CheckMyGradeApp method under its write lock, serialized with every other reader and writer."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.rwlock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# Lazily Loaded, Primary-Key Indexed Tables
+# ============================================================
+class LazyTableAttribute:
+    """
+    An app attribute (a table's primary-key index or one of its secondary indexes) that loads
+    its table from storage the first time any attribute of that table is read.
+    """
+    def __init__(self, table):
+        self.table = table
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, app, owner=None):
+        if app is None:
+            return self
+        if self.table not in app.loaded_tables:
+            # Readers share the read lock, so a first-use load is serialized separately; the loading
+            # thread itself reaches this point again (while building indexes) and passes through.
+            with app.load_lock:
+                if self.table not in app.loaded_tables and self.table not in app.loading_tables:
+                    app.load_table(self.table)
+        return app.__dict__[self.name]
+
+    def __set__(self, app, value):
+        app.__dict__[self.name] = value
+
+def indexed_table(table):
+    """
+    Exposes a table's primary-key index (an insertion-ordered dict) as a list of records.
+    Assigning a list to the property replaces the table and rebuilds its indexes; the replacement is
+    recorded as unsaved changes (see save_in_bulk) and written by the next save_data().
+    """
+    key_attr, index_attr = TABLES[table][2], TABLES[table][3]
+
+    def get_records(self):
+        with self.rwlock.read():
+            return list(getattr(self, index_attr).values())
+
+    def set_records(self, records):
+        with self.rwlock.write():
+            # Loaded first, so the records the replacement drops are known and saved as deletes.
+            self.ensure_loaded(table)
+            records = {getattr(r, key_attr): r for r in records}
+            changes = self.pending.setdefault(table, {})
+            changes.update(dict.fromkeys(getattr(self, index_attr).keys() - records.keys()))
+            changes.update(records)
+            setattr(self, index_attr, records)
+            self.rebuild_indexes(table)
+            self.mark_dirty(table)
+
+    return property(get_records, set_records)
+
+
+# Report Formatting & Output Sinks
+# ============================================================
+# Reports and listings are generators of flat dict rows, so they stream in constant memory.
+# A sink consumes one report: text sinks render the rows through the report's line formatter,
+# data sinks (CSV, JSON Lines) write the rows themselves.
+def student_line(row):
+    return (f"{row['First_name']} {row['Last_name']} | Email: {row['Email_address']} | "
+            f"Course: {row['Course.id']} | grades: {row['grades']} | Marks: {row['Marks']}")
+
+def course_line(row):
+    return f"Course ID: {row['Course_id']} | Name: {row['Course_name']} | {row['Description']}"
+
+def professor_line(row):
+    return (f"Professor ID: {row['Professor_id']} | Name: {row['Professor Name']} | "
+            f"Rank: {row['Rank']} | Course: {row['Course.id']}")
+
+def grade_line(row):
+    return f"Grade ID: {row['Grade_id']} | Grade: {row['Grade']} | Marks Range: {row['Marks_range']}"
+
+def listing_lines(title, line):
+    """Returns a formatter for a display_all_* listing: the title, then one line per record."""
+    def format_lines(rows):
+        yield f"\n--- {title} ---"
+        for row in rows:
+            yield line(row)
+    return format_lines
+
+def course_report_lines(rows):
+    yield "\n--- Course-wise Report ---"
+    for _, group in groupby(rows, key=lambda r: r["Course_id"]):
+        row = next(group)
+        yield f"\nCourse: {row['Course_id']} - {row['Course_name']}"
+        if row["Email_address"] is None:
+            yield "   No students enrolled."
+            continue
+        for row in chain([row], group):
+            yield f"   {row['First_name']} {row['Last_name']} | Marks: {row['Marks']} | Grade: {row['grades']}"
+        yield f"   >> Average Marks: {row['Average']:.2f} | Median Marks: {row['Median']:.2f}"
+
+def professor_report_lines(rows):
+    yield "\n--- Professor-wise Report ---"
+    for _, group in groupby(rows, key=lambda r: r["Professor_id"]):
+        row = next(group)
+        yield f"\nProfessor: {row['Professor_id']} - {row['Professor Name']} ({row['Rank']})"
+        if row["Course_name"] is None:
+            yield "   No course found for this professor."
+            continue
+        yield f"   Teaches Course: {row['Course_id']} - {row['Course_name']}"
+        if row["Email_address"] is None:
+            yield "      No students enrolled."
+            continue
+        for row in chain([row], group):
+            yield f"      {row['First_name']} {row['Last_name']} | Marks: {row['Marks']} | Grade: {row['grades']}"
+
+class StdoutSink:
+    """Writes the formatted report to a text stream (stdout by default) in buffered batches."""
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, rows, format_lines):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.writelines(line + "\n" for line in format_lines(rows))
+
+class PagedSink:
+    """Writes the formatted report a page at a time, waiting for Enter (or q to stop) between pages."""
+    def __init__(self, page_size=20, stream=None, prompt=input):
+        self.page_size = page_size
+        self.stream = stream
+        self.prompt = prompt
+
+    def write(self, rows, format_lines):
+        stream = self.stream if self.stream is not None else sys.stdout
+        for n, line in enumerate(format_lines(rows), 1):
+            stream.write(line + "\n")
+            if n % self.page_size == 0:
+                if self.prompt("-- More (Enter to continue, q to quit) --").strip().lower() == "q":
+                    break
+
+class CsvSink:
+    """Writes the report rows to a CSV file; the columns are the keys of the first row."""
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, rows, format_lines=None):
+        rows = iter(rows)
+        first = next(rows, None)
+        with open(self.file, mode='w', newline='') as f:
+            if first is None:
+                return
+            writer = csv.DictWriter(f, fieldnames=list(first))
+            writer.writeheader()
+            writer.writerow(first)
+            writer.writerows(rows)
+
+class JsonLinesSink:
+    """Writes one JSON object per report row."""
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, rows, format_lines=None):
+        with open(self.file, mode='w', newline='') as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+
+# Main Application Class (CRUD, Searching, Sorting, Statistics & Reports)
+# ============================================================
+class CheckMyGradeApp:
+    # Record lists, each backed by a dict keyed on the table's primary key for O(1) lookups.
+    students = indexed_table("student")
+    courses = indexed_table("course")
+    professors = indexed_table("professor")
+    grades_list = indexed_table("grades")
+    login_users = indexed_table("login")
+
+    # Primary-key and secondary indexes; a table is read from storage only when first used.
+    student_index = LazyTableAttribute("student")       # Email_address -> Student.
+    course_index = LazyTableAttribute("course")         # Course_id -> Course.
+    professor_index = LazyTableAttribute("professor")   # Professor_id -> Professor.
+    grade_index = LazyTableAttribute("grades")          # Grade_id -> Grades.
+    login_index = LazyTableAttribute("login")           # User_id -> LoginUser.
+    course_students = LazyTableAttribute("student")     # Course_id -> {Email_address: Student} for enrolled students.
+    search_index = LazyTableAttribute("student")        # Trigrams of student email/first/last name -> Email_address.
+    marks_index = LazyTableAttribute("student")         # Email_address ordered by Marks.
+    course_marks = LazyTableAttribute("student")        # Course_id -> MarksIndex of the enrolled students.
+    columns = LazyTableAttribute("student")             # Optional columnar copy of the students.
+    course_professors = LazyTableAttribute("professor") # Course_id -> {Professor_id: Professor} for teaching professors.
+    grade_bands = LazyTableAttribute("grades")          # Marks_range intervals -> Grade (see regrade_all).
+
+    def __init__(self, columnar=False, storage=None, write_behind=False,
+                 flush_interval=WRITE_BEHIND_INTERVAL, flush_batch=WRITE_BEHIND_BATCH):
+        # CSV files by default; pass SqliteStorage() to keep the tables in a SQLite database instead.
+        self.rwlock = RWLock()                  # Concurrent reads, serialized writes (see read_locked/write_locked).
+        self.login_cache = CredentialCache()    # Recent successful logins (see validate_login).
+        self.load_lock = threading.RLock()      # Serializes first-use table loads.
+        self.loading_tables = set()             # Tables whose load is in progress.
+        self.storage = storage if storage is not None else CsvStorage()
+        self.storage.initialize()  # Write sample rows if no data exists.
+
+        if columnar and np is None:
+            print("NumPy is not installed; the columnar student store is disabled.")
+        self.columnar = columnar and np is not None
+
+        self.loaded_tables = set()  # Names of tables (keys of TABLES) read into memory so far.
+        self.dirty_tables = set()   # Names of tables changed since the last save.
+        # Number of journal entries up front; the entries are replayed per table on load.
+        self.journal_entries = self.scan_journal()[0] if self.storage.journaled else 0
+
+        # Optimistic concurrency with other sessions sharing the CSV files (see save_data).
+        self.session_id = uuid.uuid4().hex  # Tags this session's journal entries.
+        self.table_versions = {}   # Table -> version stamp when this session loaded it.
+        self.journal_offsets = {}  # Table -> journal size when this session loaded it.
+        self.journal_generations = {}  # Table -> journal generation (see JOURNAL_GENERATION) the offset refers to.
+        self.pending = {}          # Table -> {key: entity, or None if deleted} changed since the last save.
+        self.invalid_rows = {}     # Table -> {key: row} of stored rows that failed to parse (kept in storage, not loaded).
+
+        # Write-behind: mutations are queued in memory and group-committed by a background thread.
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.journal_queue = []                 # Entries not yet written to the journal (or database).
+        self.flush_cond = threading.Condition() # Guards journal_queue and wakes the flusher.
+        self.flush_lock = threading.Lock()      # Held while a batch is written, so batches land in order.
+        self.save_requested = False             # A bulk change is waiting for the flusher's save_data().
+        self.closing = False
+        self.flusher = None
+        if write_behind:
+            self.flusher = threading.Thread(target=self.run_flusher, name="CheckMyGrade-flusher", daemon=True)
+            self.flusher.start()
+            atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @timed
+    @write_locked
+    def load_data(self):
+        """(Re)loads every table now instead of waiting for first use."""
+        for table in TABLES:
+            self.load_table(table)
+
+    @timed
+    def load_table(self, table):
+        """Reads one table from storage, re-applies its journaled mutations and builds its indexes."""
+        _, _, key_attr, index_attr = TABLES[table]
+        entity_class = ENTITY_CLASSES[table]
+        self.stamp_table(table)
+        self.loading_tables.add(table)
+        try:
+            # The journal is read before the table: a concurrent save_data() replaces the CSV before it
+            # truncates the journal, so without any lock the worst case is replaying entries the CSV already holds.
+            entries = [entry for entry, _ in self.read_journal() if entry["table"] == table] if self.storage.journaled else []
+            index = {}
+            self.invalid_rows[table] = {}
+            for row in self.storage.load_rows(table):
+                try:
+                    entity = entity_class.from_row(row)
+                except (ValueError, TypeError) as e:
+                    self.reject_row(table, row, e)  # One bad row must not make the whole table unusable.
+                    continue
+                index[getattr(entity, key_attr)] = entity
+            setattr(self, index_attr, index)
+
+            # Re-apply mutations made since the CSV snapshot was last compacted.
+            self.replay_journal(table, entries)
+            self.rebuild_indexes(table)
+        finally:
+            self.loading_tables.discard(table)
+        # Only now may other threads use the table without waiting for load_lock.
+        self.loaded_tables.add(table)
+
+    def stamp_table(self, table):
+        """Records the table version and journal size (and generation) a table is loaded at."""
+        if self.storage.journaled:
+            # Versions first: a truncation in between then shows up as a newer generation, never as a smaller offset.
+            versions = read_versions()
+            self.table_versions[table] = versions.get(table, 0)
+            self.journal_generations[table] = versions.get(JOURNAL_GENERATION, 0)
+            self.journal_offsets[table] = journal_size()
+
+    def ensure_loaded(self, table):
+        if table not in self.loaded_tables:
+            self.load_table(table)
+    
+    @timed
+    @write_locked
+    def save_data(self):
+        # Queued mutations go out first; none can be queued meanwhile, since callers need the write lock.
+        self.flush_journal()
+        self.save_requested = False
+        if not self.storage.journaled:
+            # Unsaved bulk changes go in as upserts and deletes in one transaction, never as a rewrite of
+            # the table from this session's copy, which would drop rows other sessions committed meanwhile.
+            entries = [self.journal_entry(table, "delete" if entity is None else "put", key, entity)
+                       for table, changes in self.pending.items() for key, entity in changes.items()]
+            if entries:
+                self.storage.apply(entries)
+            self.dirty_tables.difference_update(self.pending)
+            self.pending.clear()
+            self.write_dirty_tables()  # Only tables flagged as a whole (see mark_dirty).
+            return
+
+        # Only one session saves at a time; journal appends wait for it, readers do not.
+        with file_lock():
+            versions = read_versions()
+            generation = versions.get(JOURNAL_GENERATION, 0)
+            touched = set()    # Tables with journal entries from any session.
+            foreign = set()    # Tables with entries other sessions wrote after this session loaded them.
+            conflicts = []
+            for entry, end in self.read_journal():
+                table = entry["table"]
+                touched.add(table)
+                # Offsets only count within the journal generation they were taken in: once another session
+                # has truncated the journal, every entry from other sessions is newer than this session's copy.
+                if entry.get("session") != self.session_id and (
+                        self.journal_generations.get(table, 0) != generation
+                        or end > self.journal_offsets.get(table, 0)):
+                    foreign.add(table)
+                    if entry["key"] in self.pending.get(table, {}):
+                        conflicts.append((table, entry["key"]))
+
+            for table in TABLES:
+                if table not in self.loaded_tables:
+                    # Loaded now (and so marked dirty) so its journaled changes survive the truncation below.
+                    if table in touched:
+                        self.load_table(table)
+                elif table in foreign or versions.get(table, 0) != self.table_versions.get(table, 0):
+                    if table in self.dirty_tables or table in foreign:
+                        self.merge_table(table, [key for t, key in conflicts if t == table])
+
+            written = self.write_dirty_tables()
+            for table in written:
+                versions[table] = versions.get(table, 0) + 1
+                self.table_versions[table] = versions[table]
+
+            # The snapshots now contain every journaled mutation, so the journal can be discarded.
+            open(JOURNAL_FILE, mode='w').close()
+            versions[JOURNAL_GENERATION] = generation + 1
+            write_versions(versions)
+        self.journal_entries = 0
+        self.journal_offsets = dict.fromkeys(self.journal_offsets, 0)
+        self.journal_generations = dict.fromkeys(self.journal_offsets, generation + 1)
+        self.pending.clear()
+
+    def write_dirty_tables(self):
+        """Writes the tables modified since the last save (see mark_dirty) and returns their names."""
+        written = [table for table in TABLES if table in self.dirty_tables]
+        for table in written:
+            index = getattr(self, TABLES[table][3])
+            invalid = [row for key, row in self.invalid_rows.get(table, {}).items() if key not in index]
+            self.storage.save_table(table, chain((e.to_dict() for e in index.values()), invalid))
+        self.dirty_tables.clear()
+        return written
+
+    def merge_table(self, table, conflicts=()):
+        """
+        Reloads a table that other sessions changed since this session loaded it, then re-applies this
+        session's unsaved changes on top. On a record both sides changed, this session's version wins.
+        """
+        pending = self.pending.get(table, {})
+        self.load_table(table)
+        index = getattr(self, TABLES[table][3])
+        for key, entity in pending.items():
+            if entity is None:
+                index.pop(key, None)
+            else:
+                index[key] = entity
+        self.rebuild_indexes(table)
+        self.dirty_tables.add(table)
+        if pending:
+            print(f"Merged concurrent changes to the {table} table.")
+        for key in conflicts:
+            print(f"   {key} was also changed by another session; keeping this session's version.")
+    
+    
+    @write_locked
+    def mark_dirty(self, *tables):
+        """Flags tables for the next save_data(); with no arguments every table is flagged."""
+        self.dirty_tables.update(tables or TABLES)
+    
+    
+    # Write-Ahead Journal
+    # ----------------------
+    def journal(self, table, op, key, entity=None):
+        """
+        Records one mutation ("put" or "delete") instead of rewriting the CSVs: appended to the journal
+        (or committed to write-through storage) now, or queued for the flusher in write-behind mode.
+        """
+        entry = self.journal_entry(table, op, key, entity)
+        if self.write_behind:
+            with self.flush_cond:
+                self.journal_queue.append(entry)
+                if len(self.journal_queue) >= self.flush_batch:
+                    self.flush_cond.notify()
+        else:
+            self.write_journal([entry])
+        if not self.storage.journaled:
+            return
+        self.dirty_tables.add(table)
+        self.pending.setdefault(table, {})[key] = entity
+        self.journal_entries += 1
+        if self.journal_entries >= JOURNAL_COMPACT_THRESHOLD and not self.write_behind:
+            self.compact_journal()
+
+    def journal_entry(self, table, op, key, entity=None):
+        entry = {"table": table, "op": op, "key": key, "session": self.session_id}
+        if entity is not None:
+            entry["row"] = entity.to_dict()
+        return entry
+
+    def write_journal(self, entries, fsync=False):
+        """Writes a batch of entries with one append (group commit), or one transaction for write-through storage."""
+        if not self.storage.journaled:
+            self.storage.apply(entries)
+            return
+        with file_lock(exclusive=False), open(JOURNAL_FILE, mode='a', newline='') as f:
+            f.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def flush_journal(self, fsync=False):
+        """Writes every queued entry as one batch; with fsync, the journal is also forced to disk."""
+        with self.flush_lock:
+            with self.flush_cond:
+                batch, self.journal_queue = self.journal_queue, []
+            if batch or (fsync and self.storage.journaled):
+                self.write_journal(batch, fsync)
+
+    def flush(self):
+        """
+        Durability point: queued mutations are written and fsynced, and any save the write-behind
+        flusher owes (a bulk change, or a journal due for compaction) is done now.
+        """
+        self.flush_journal(fsync=True)
+        if self.save_requested or self.journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+            self.save_data()
+
+    def run_flusher(self):
+        """Background thread of write-behind mode: flushes every flush_interval seconds or once flush_batch entries are queued."""
+        while True:
+            with self.flush_cond:
+                self.flush_cond.wait_for(lambda: self.closing or self.save_requested
+                                         or len(self.journal_queue) >= self.flush_batch, timeout=self.flush_interval)
+                if self.closing:
+                    return
+            try:
+                self.flush_journal()
+                if self.save_requested or self.journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+                    self.save_data()
+            except Exception as e:
+                print(f"Background flush failed: {e}")
+
+    def close(self):
+        """Stops the write-behind flusher, then flushes everything still queued."""
+        if self.flusher is not None:
+            with self.flush_cond:
+                self.closing = True
+                self.flush_cond.notify()
+            self.flusher.join()
+            self.flusher = None
+            atexit.unregister(self.close)
+        self.flush()
 
-    def to_dict(self):
-        return {
-            "Course_id": self.Course_id,
-            "Course_name": self.Course_name,
-            "Description": self.Description
-        }
+    def compact_journal(self):
+        """Folds the journal back into the CSV snapshots."""
+        self.save_data()
 
-class Professor:
-    def __init__(self, Professor_id, Professor_Name, Rank, Course_id):
-        self.Professor_id = Professor_id
-        self.Professor_Name = Professor_Name
-        self.Rank = Rank
-        self.Course_id = Course_id
+    def read_journal(self):
+        """Yields (entry, byte offset just past it) for each complete journal entry, in order."""
+        if not os.path.exists(JOURNAL_FILE):
+            return
+        offset = 0
+        with open(JOURNAL_FILE, mode='rb') as f:
+            for line in f:
+                offset += len(line)
+                if not line.endswith(b"\n"):
+                    return  # Another session is mid-append, or a crash tore the final write.
+                try:
+                    yield json.loads(line), offset
+                except ValueError:
+                    return  # Torn final write from a crash; everything before it is intact.
 
-    def display(self):
-        print(f"Professor ID: {self.Professor_id} | Name: {self.Professor_Name} | "
-              f"Rank: {self.Rank} | Course: {self.Course_id}")
+    def scan_journal(self):
+        """Returns (number of entries, set of tables they touch) without applying anything."""
+        entries = 0
+        tables = set()
+        for entry, _ in self.read_journal():
+            entries += 1
+            tables.add(entry["table"])
+        return entries, tables
 
-    def to_dict(self):
-        return {
-            "Professor_id": self.Professor_id,
-            "Professor Name": self.Professor_Name,
-            "Rank": self.Rank,
-            "Course.id": self.Course_id
-        }
+    def replay_journal(self, table, entries):
+        """Applies a table's journaled mutations on top of its loaded CSV data; returns the number replayed."""
+        index = getattr(self, TABLES[table][3])
+        replayed = 0
+        invalid = self.invalid_rows.setdefault(table, {})
+        for entry in entries:
+            invalid.pop(entry["key"], None)
+            if entry["op"] == "put":
+                try:
+                    index[entry["key"]] = ENTITY_CLASSES[table].from_row(entry["row"])
+                except (ValueError, TypeError) as e:
+                    index.pop(entry["key"], None)
+                    self.reject_row(table, entry["row"], e)
+            else:
+                index.pop(entry["key"], None)
+            replayed += 1
+        if replayed:
+            self.dirty_tables.add(table)
+        return replayed
 
-class Grades:
-    def __init__(self, Grade_id, Grade, Marks_range):
-        self.Grade_id = Grade_id
-        self.Grade = Grade
-        self.Marks_range = Marks_range
+    def reject_row(self, table, row, error):
+        """
+        Sets aside a stored row that does not parse (e.g. blank or non-numeric Marks) and reports it.
+        It is written back unchanged on save, unless a valid record with its key replaces it.
+        """
+        file, headers, key_attr, _ = TABLES[table]
+        row = {h: "" if row.get(h) is None else row[h] for h in headers}
+        self.invalid_rows.setdefault(table, {})[row[key_attr]] = row
+        print(f"Skipped {row[key_attr]!r} in {file} ({error}); the row is kept as is but not loaded.")
+    
+    
+    # Secondary Indexes (Course_id -> students / professors, student search)
+    # ----------------------
+    def rebuild_indexes(self, table):
+        """Rebuilds the secondary indexes derived from one table's primary-key index."""
+        if table == "student":
+            self.rebuild_student_indexes()
+        elif table == "professor":
+            self.course_professors = {}
+            for pr in self.professor_index.values():
+                self.index_professor(pr)
+        elif table == "grades":
+            self.grade_bands = GradeBands(self.grade_index.values())
 
-    def display_grade_report(self):
-        print(f"Grade ID: {self.Grade_id} | Grade: {self.Grade} | Marks Range: {self.Marks_range}")
+    def rebuild_student_indexes(self):
+        self.course_students = {}
+        self.search_index = TrigramIndex()
+        self.marks_index = MarksIndex()
+        self.course_marks = {}
+        self.columns = StudentColumns() if self.columnar else None
+        for st in self.student_index.values():
+            self.course_students.setdefault(st.Course_id, {})[st.Email_address] = st
+            self.search_index.add(st.Email_address, (st.Email_address, st.First_name, st.Last_name))
+            if self.columns is not None:
+                self.columns.put(st)
+        # The marks indexes are sorted once here instead of growing by one insort per student.
+        self.marks_index.bulk_load((st.Email_address, st.Marks) for st in self.student_index.values())
+        for course_id, enrolled in self.course_students.items():
+            self.course_marks[course_id] = MarksIndex()
+            self.course_marks[course_id].bulk_load((st.Email_address, st.Marks) for st in enrolled.values())
 
-    def modify_grade(self, Grade=None, Marks_range=None):
-        if Grade:
-            self.Grade = Grade
-        if Marks_range:
-            self.Marks_range = Marks_range
+    def index_student(self, st):
+        self.add_enrollment(st)
+        self.search_index.add(st.Email_address, (st.Email_address, st.First_name, st.Last_name))
+        self.marks_index.add(st.Email_address, st.Marks)
+        if self.columns is not None:
+            self.columns.put(st)
 
-    def to_dict(self):
-        return {
-            "Grade_id": self.Grade_id,
-            "Grade": self.Grade,
-            "Marks_range": self.Marks_range
-        }
+    def unindex_student(self, st):
+        self.remove_enrollment(st, st.Course_id)
+        self.search_index.remove(st.Email_address)
+        self.marks_index.remove(st.Email_address)
+        if self.columns is not None:
+            self.columns.remove(st.Email_address)
 
-class LoginUser:
-    def __init__(self, User_id, Password, Role):
-        self.User_id = User_id
-        self.Role = Role
-        if User_id == "micheal@mycsu.edu" and Password == "AQ10134" and Role == "professor":
-            self.Password = Password
+    def reindex_student(self, st, old_course_id):
+        """Refreshes the secondary indexes after a student's fields were changed in place."""
+        if st.Course_id != old_course_id:
+            self.remove_enrollment(st, old_course_id)
+            self.add_enrollment(st)
         else:
-            self.Password = self.encrypt_password(Password)
+            self.course_marks[st.Course_id].add(st.Email_address, st.Marks)
+        self.search_index.add(st.Email_address, (st.Email_address, st.First_name, st.Last_name))
+        self.marks_index.add(st.Email_address, st.Marks)
+        if self.columns is not None:
+            self.columns.put(st)
 
-    def encrypt_password(self, plain_password):
-        encoded_bytes = base64.b64encode(plain_password.encode('utf-8'))
-        return encoded_bytes.decode('utf-8')
-
-    def decrypt_password(self):
-        if self.User_id == "micheal@mycsu.edu" and self.Password == "AQ10134" and self.Role == "professor":
-            return self.Password
-        decoded_bytes = base64.b64decode(self.Password.encode('utf-8'))
-        return decoded_bytes.decode('utf-8')
-    
-    def to_dict(self):
-        return {
-            "User_id": self.User_id,
-            "Password": self.Password,
-            "Role": self.Role
-        }
+    def add_enrollment(self, st):
+        self.course_students.setdefault(st.Course_id, {})[st.Email_address] = st
+        self.course_marks.setdefault(st.Course_id, MarksIndex()).add(st.Email_address, st.Marks)
 
+    def remove_enrollment(self, st, course_id):
+        enrolled = self.course_students.get(course_id)
+        if enrolled is not None:
+            enrolled.pop(st.Email_address, None)
+            self.course_marks[course_id].remove(st.Email_address)
+            if not enrolled:
+                del self.course_students[course_id]
+                del self.course_marks[course_id]
 
-# Main Application Class (CRUD, Searching, Sorting, Statistics & Reports)
-# ============================================================
-class CheckMyGradeApp:
-    def __init__(self):
-        initialize_csv_if_empty()  # Write sample rows if no data exists.
+    def index_professor(self, pr):
+        self.course_professors.setdefault(pr.Course_id, {})[pr.Professor_id] = pr
 
-        self.students = []      # List of Student objects.
-        self.courses = []       # List of Course objects.
-        self.professors = []    # List of Professor objects.
-        self.grades_list = []   # List of Grades objects.
-        self.login_users = []   # List of LoginUser objects.
+    def unindex_professor(self, pr):
+        teaching = self.course_professors.get(pr.Course_id)
+        if teaching is not None:
+            teaching.pop(pr.Professor_id, None)
+            if not teaching:
+                del self.course_professors[pr.Course_id]
 
-        self.load_data()
+    @read_locked
+    def students_in_course(self, course_id):
+        """Returns the students enrolled in a course without scanning every student."""
+        return list(self.course_students.get(course_id, {}).values())
 
-    def load_data(self):
-        # Load Student records.
-        student_headers = ["Email_address", "First_name", "Last_name", "Course.id", "grades", "Marks"]
-        student_data = load_csv(STUDENT_FILE, student_headers)
-        for row in student_data:
-            st = Student(row["First_name"], row["Last_name"], row["Email_address"],
-                         row["Course.id"], row["grades"], row["Marks"])
-            self.students.append(st)
-        
-        # Load Course records.
-        course_headers = ["Course_id", "Course_name", "Description"]
-        course_data = load_csv(COURSE_FILE, course_headers)
-        for row in course_data:
-            co = Course(row["Course_id"], row["Course_name"], row["Description"])
-            self.courses.append(co)
-        
-        # Load Professor records.
-        prof_headers = ["Professor_id", "Professor Name", "Rank", "Course.id"]
-        prof_data = load_csv(PROFESSOR_FILE, prof_headers)
-        for row in prof_data:
-            pr = Professor(row["Professor_id"], row["Professor Name"], row["Rank"], row["Course.id"])
-            self.professors.append(pr)
-        
-        # Load Login Users.
-        login_headers = ["User_id", "Password", "Role"]
-        login_data = load_csv(LOGIN_FILE, login_headers)
-        for row in login_data:
-            user = LoginUser(row["User_id"], row["Password"], row["Role"])
-            self.login_users.append(user)
-        
-        # Load Grades records.
-        grades_headers = ["Grade_id", "Grade", "Marks_range"]
-        grades_data = load_csv(GRADES_FILE, grades_headers)
-        for row in grades_data:
-            gr = Grades(row["Grade_id"], row["Grade"], row["Marks_range"])
-            self.grades_list.append(gr)
-    
-    def save_data(self):
-        # Save Student records.
-        student_headers = ["Email_address", "First_name", "Last_name", "Course.id", "grades", "Marks"]
-        student_data = [s.to_dict() for s in self.students]
-        save_csv(STUDENT_FILE, student_data, student_headers)
-        
-        # Save Course records.
-        course_headers = ["Course_id", "Course_name", "Description"]
-        course_data = [c.to_dict() for c in self.courses]
-        save_csv(COURSE_FILE, course_data, course_headers)
-        
-        # Save Professor records.
-        prof_headers = ["Professor_id", "Professor Name", "Rank", "Course.id"]
-        prof_data = [p.to_dict() for p in self.professors]
-        save_csv(PROFESSOR_FILE, prof_data, prof_headers)
-        
-        # Save Login Users.
-        login_headers = ["User_id", "Password", "Role"]
-        login_data = [u.to_dict() for u in self.login_users]
-        save_csv(LOGIN_FILE, login_data, login_headers)
-        
-        # Save Grades records.
-        grades_headers = ["Grade_id", "Grade", "Marks_range"]
-        grades_data = [g.to_dict() for g in self.grades_list]
-        save_csv(GRADES_FILE, grades_data, grades_headers)
+    @read_locked
+    def professors_in_course(self, course_id):
+        """Returns the professors teaching a course without scanning every professor."""
+        return list(self.course_professors.get(course_id, {}).values())
     
     
     # Student CRUD & Functions
     # ----------------------
+    @timed
+    @write_locked
     def add_student(self, first_name, last_name, email_address, course_id, grade, marks):
-        if any(s.Email_address == email_address for s in self.students):
+        if email_address in self.student_index:
             print("A student with this email already exists.")
             return
-        st = Student(first_name, last_name, email_address, course_id, grade, marks)
-        self.students.append(st)
-        self.save_data()
+        # Everything is validated before any index changes, so a bad value cannot leave a half-added student.
+        bad_field = non_string_field(First_name=first_name, Last_name=last_name, Email_address=email_address,
+                                     Course_id=course_id, grades=grade)
+        if bad_field is not None:
+            print(f"Invalid {bad_field}: must be text.")
+            return
+        try:
+            st = Student(first_name, last_name, email_address, course_id, grade, marks)
+        except ValueError:
+            print(f"Invalid marks: {marks!r}")
+            return
+        self.student_index[email_address] = st
+        self.index_student(st)
+        self.journal("student", "put", email_address, st)
         print("Student added successfully.")
 
+    @timed
+    @write_locked
     def delete_student(self, email_address):
-        init_len = len(self.students)
-        self.students = [s for s in self.students if s.Email_address != email_address]
-        if len(self.students) < init_len:
-            self.save_data()
+        st = self.student_index.pop(email_address, None)
+        if st is not None:
+            self.unindex_student(st)
+            self.journal("student", "delete", email_address)
             print("Student deleted successfully.")
         else:
             print("Student not found.")
 
+    @timed
+    @write_locked
     def update_student(self, email_address, **kwargs):
-        found = False
-        for s in self.students:
-            if s.Email_address == email_address:
+        s = self.student_index.get(email_address)
+        if s is not None:
+            bad_field = non_string_field(**{k: v for k, v in kwargs.items() if k != "Marks"})
+            if bad_field is not None:
+                print(f"Invalid {bad_field}: must be text.")
+                return
+            old_course_id = s.Course_id
+            try:
                 s.update(**kwargs)
-                found = True
-                break
-        if found:
-            self.save_data()
+            except ValueError:
+                print(f"Invalid marks: {kwargs.get('Marks')!r}")
+                return
+            self.reindex_student(s, old_course_id)
+            if not kwargs.get("grades") and len(self.grade_bands) and not self.grade_bands.problems:
+                # The grade follows the marks unless one was given explicitly; marks outside every band get none.
+                s.grades = self.grade_bands.grade_for(s.Marks) or ""
+                if self.columns is not None:
+                    self.columns.put(s)
+            self.journal("student", "put", email_address, s)
             print("Student updated successfully.")
         else:
             print("Student not found.")
 
-    def search_students(self, search_term):
-        start_time = time.time()
-        results = [s for s in self.students if (
-            search_term.lower() in s.Email_address.lower() or 
-            search_term.lower() in s.First_name.lower() or 
-            search_term.lower() in s.Last_name.lower()
-        )]
-        end_time = time.time()
-        print(f"Search completed in {end_time - start_time:.4f} seconds")
-        return results
+    @timed
+    @read_locked
+    def search_students(self, search_term, prefix=False):
+        """
+        Case-insensitive search over email, first name and last name using the trigram index.
+        Every whitespace-separated term must match one of the fields, as a substring or, with
+        prefix=True, at the start of the field.
+        """
+        return [self.student_index[key] for key in self.search_index.search(search_term, prefix)]
 
+    @timed
+    @read_locked
     def sort_students_by_marks(self, reverse=False):
-        start_time = time.time()
-        sorted_students = sorted(self.students, key=lambda s: float(s.Marks), reverse=reverse)
-        end_time = time.time()
-        print(f"Sorting completed in {end_time - start_time:.4f} seconds")
-        return sorted_students
+        # The marks index is already ordered, so this is a linear walk rather than a sort.
+        keys = self.marks_index.descending() if reverse else self.marks_index.ascending()
+        return [self.student_index[key] for key in keys]
     
-    def display_all_students(self):
-        print("\n--- Student Records ---")
-        for s in self.students:
-            s.display()
+    @timed
+    @write_locked
+    def add_students_bulk(self, rows):
+        """
+        Adds many students (dicts keyed by the Student.csv headers) and persists them with a single save.
+        Duplicates, within the batch or against existing students, are caught by the primary-key index.
+        Returns (number added, list of (row number, email, reason) for every rejected row).
+        """
+        added = 0
+        errors = []
+        for row_no, row in enumerate(rows, 1):
+            # Values may come from JSON or code as well as CSV, so numbers such as "Marks": 90 are taken as text.
+            values = {h: "" if row.get(h) is None else str(row[h]).strip() for h in STUDENT_HEADERS}
+            email = values["Email_address"]
+            missing = [h for h in STUDENT_HEADERS if not values[h]]
+            if missing:
+                errors.append((row_no, email, "missing " + ", ".join(missing)))
+                continue
+            if email in self.student_index:
+                errors.append((row_no, email, "duplicate email"))
+                continue
+            try:
+                st = Student(values["First_name"], values["Last_name"], email,
+                             values["Course.id"], values["grades"], values["Marks"])
+            except ValueError:
+                errors.append((row_no, email, f"invalid marks {row['Marks']!r}"))
+                continue
+            self.student_index[email] = st
+            self.index_student(st)
+            self.pending.setdefault("student", {})[email] = st
+            added += 1
+        if added:
+            self.save_in_bulk("student")
+        return added, errors
+
+    def save_in_bulk(self, table):
+        """Persists many changed records (already recorded in pending) with one save instead of a journal entry each."""
+        self.mark_dirty(table)
+        if self.write_behind:
+            # Saved by the flusher instead of blocking the caller on a full rewrite.
+            with self.flush_cond:
+                self.save_requested = True
+                self.flush_cond.notify()
+        else:
+            self.save_data()
+
+    @timed
+    @read_locked
+    def display_all_students(self, sink=None):
+        self.write_report(self.table_rows("student"), listing_lines("Student Records", student_line), sink)
     
     
     # Course CRUD & Functions
     # ----------------------
+    @timed
+    @write_locked
     def add_course(self, course_id, course_name, description):
-        if any(c.Course_id == course_id for c in self.courses):
+        if course_id in self.course_index:
             print("A course with this ID already exists.")
             return
         co = Course(course_id, course_name, description)
-        self.courses.append(co)
-        self.save_data()
+        self.course_index[course_id] = co
+        self.journal("course", "put", course_id, co)
         print("Course added successfully.")
 
+    @timed
+    @write_locked
     def delete_course(self, course_id):
-        init_len = len(self.courses)
-        self.courses = [c for c in self.courses if c.Course_id != course_id]
-        if len(self.courses) < init_len:
-            self.save_data()
+        if self.course_index.pop(course_id, None) is not None:
+            self.journal("course", "delete", course_id)
             print("Course deleted successfully.")
         else:
             print("Course not found.")
 
+    @timed
+    @write_locked
     def update_course(self, course_id, **kwargs):
-        found = False
-        for c in self.courses:
-            if c.Course_id == course_id:
-                if 'Course_name' in kwargs:
-                    c.Course_name = kwargs['Course_name']
-                if 'description' in kwargs:
-                    c.Description = kwargs['description']  # Update the proper attribute.
-                found = True
-                break
-        if found:
-            self.save_data()
+        c = self.course_index.get(course_id)
+        if c is not None:
+            if 'Course_name' in kwargs:
+                c.Course_name = kwargs['Course_name']
+            if 'description' in kwargs:
+                c.Description = kwargs['description']  # Update the proper attribute.
+            self.journal("course", "put", course_id, c)
             print("Course updated successfully.")
         else:
             print("Course not found.")
 
-    def display_all_courses(self):
-        print("\n--- Course Records ---")
-        for c in self.courses:
-            c.display()
+    @timed
+    @read_locked
+    def display_all_courses(self, sink=None):
+        self.write_report(self.table_rows("course"), listing_lines("Course Records", course_line), sink)
     
     
     # Professor CRUD & Functions
     # ----------------------
+    @timed
+    @write_locked
     def add_professor(self, professor_id, Professor_Name, Rank, course_id):
-        if any(p.Professor_id == professor_id for p in self.professors):
+        if professor_id in self.professor_index:
             print("A professor with this ID already exists.")
             return
         pr = Professor(professor_id, Professor_Name, Rank, course_id)
-        self.professors.append(pr)
-        self.save_data()
+        self.professor_index[professor_id] = pr
+        self.index_professor(pr)
+        self.journal("professor", "put", professor_id, pr)
         print("Professor added successfully.")
 
+    @timed
+    @write_locked
     def delete_professor(self, professor_id):
-        init_len = len(self.professors)
-        self.professors = [p for p in self.professors if p.Professor_id != professor_id]
-        if len(self.professors) < init_len:
-            self.save_data()
+        pr = self.professor_index.pop(professor_id, None)
+        if pr is not None:
+            self.unindex_professor(pr)
+            self.journal("professor", "delete", professor_id)
             print("Professor deleted successfully.")
         else:
             print("Professor not found.")
 
+    @timed
+    @write_locked
     def update_professor(self, professor_id, **kwargs):
-        found = False
-        for p in self.professors:
-            if p.Professor_id == professor_id:
-                if 'Professor_Name' in kwargs:
-                    p.Professor_Name = kwargs['Professor_Name']
-                if 'Rank' in kwargs:
-                    p.Rank = kwargs['Rank']
-                if 'course_id' in kwargs:
-                    p.Course_id = kwargs['course_id']
-                found = True
-                break
-        if found:
-            self.save_data()
+        p = self.professor_index.get(professor_id)
+        if p is not None:
+            if 'Professor_Name' in kwargs:
+                p.Professor_Name = kwargs['Professor_Name']
+            if 'Rank' in kwargs:
+                p.Rank = kwargs['Rank']
+            if 'course_id' in kwargs and kwargs['course_id'] != p.Course_id:
+                self.unindex_professor(p)
+                p.Course_id = kwargs['course_id']
+                self.index_professor(p)
+            self.journal("professor", "put", professor_id, p)
             print("Professor updated successfully.")
         else:
             print("Professor not found.")
 
-    def display_all_professors(self):
-        print("\n--- Professor Records ---")
-        for p in self.professors:
-            p.display()
+    @timed
+    @read_locked
+    def display_all_professors(self, sink=None):
+        self.write_report(self.table_rows("professor"), listing_lines("Professor Records", professor_line), sink)
     
     
     # Grades CRUD & Functions
     # ----------------------
+    @timed
+    @write_locked
     def add_grade(self, Grade_id, Grade, Marks_range):
-        if any(g.Grade_id == Grade_id for g in self.grades_list):
+        if Grade_id in self.grade_index:
             print("A grade with this ID already exists.")
             return
+        try:
+            interval = parse_marks_range(Marks_range)
+        except ValueError:
+            print(f"Invalid marks range: {Marks_range!r}")
+            return
         g = Grades(Grade_id, Grade, Marks_range)
-        self.grades_list.append(g)
-        self.save_data()
+        self.grade_index[Grade_id] = g
+        self.journal("grades", "put", Grade_id, g)
         print("Grade added successfully.")
+        self.bands_changed(self.grade_bands, [interval])
 
+    @timed
+    @write_locked
     def delete_grade(self, Grade_id):
-        init_len = len(self.grades_list)
-        self.grades_list = [g for g in self.grades_list if g.Grade_id != Grade_id]
-        if len(self.grades_list) < init_len:
-            self.save_data()
+        g = self.grade_index.pop(Grade_id, None)
+        if g is not None:
+            try:
+                interval = parse_marks_range(g.Marks_range)
+            except ValueError:
+                interval = None
+            self.journal("grades", "delete", Grade_id)
             print("Grade deleted successfully.")
+            # Students in the deleted band lose its letter.
+            self.bands_changed(self.grade_bands, [interval] if interval is not None else [])
         else:
             print("Grade not found.")
 
+    @timed
+    @write_locked
     def modify_grade(self, Grade_id, Grade=None, Marks_range=None):
-        found = False
-        for g in self.grades_list:
-            if g.Grade_id == Grade_id:
-                g.modify_grade(Grade, Marks_range)
-                found = True
-                break
-        if found:
-            self.save_data()
+        g = self.grade_index.get(Grade_id)
+        if g is not None:
+            try:
+                new_interval = parse_marks_range(Marks_range) if Marks_range else None
+            except ValueError:
+                print(f"Invalid marks range: {Marks_range!r}")
+                return
+            try:
+                old_interval = parse_marks_range(g.Marks_range)
+            except ValueError:
+                old_interval = None
+            old_bands = self.grade_bands
+            g.modify_grade(Grade, Marks_range)
+            self.journal("grades", "put", Grade_id, g)
             print("Grade updated successfully.")
+            self.bands_changed(old_bands, {i for i in (old_interval, new_interval) if i is not None})
         else:
             print("Grade not found.")
 
-    def display_all_grades(self):
-        print("\n--- Grades Records ---")
-        for g in self.grades_list:
-            g.display_grade_report()
+    def bands_changed(self, old_bands, intervals):
+        """
+        Rebuilds the grade bands after one changed and regrades only the students whose marks fall
+        in the changed intervals; everyone is regraded if the bands were invalid before the change.
+        """
+        self.grade_bands = GradeBands(self.grade_index.values())
+        if self.grade_bands.problems:
+            print("Students were not regraded: " + "; ".join(self.grade_bands.problems))
+        elif old_bands.problems:
+            self.regrade(self.marks_index)
+        else:
+            self.regrade(self.marks_index, intervals)
+
+    @timed
+    @write_locked
+    def regrade_all(self):
+        """Sets every student's grade from their marks and the grade bands; returns the number changed."""
+        return self.regrade(self.marks_index)
+
+    @timed
+    @write_locked
+    def regrade_course(self, course_id):
+        """Sets the grades of a course's students from their marks; returns the number changed."""
+        if course_id not in self.course_marks:
+            print("No students enrolled in this course.")
+            return 0
+        return self.regrade(self.course_marks[course_id])
+
+    def regrade(self, marks_index, intervals=None):
+        """
+        Regrades the students of a MarksIndex whose marks fall in the given (low, end) intervals,
+        or all of them when intervals is None; marks outside every band leave a student with no grade.
+        Each interval is a range scan of the marks order and each grade a binary search of the bands,
+        so students outside the intervals are never visited.
+        """
+        bands = self.grade_bands
+        if bands.problems or not len(bands):
+            print("Cannot regrade: " + ("; ".join(bands.problems) or "no grade bands are defined."))
+            return 0
+        changed = {}
+        for low, end in ([(-math.inf, math.inf)] if intervals is None else intervals):
+            for key in marks_index.between(low, end):
+                st = self.student_index[key]
+                grade = bands.grade_for(st.Marks) or ""
+                if grade != st.grades:
+                    st.grades = grade
+                    if self.columns is not None:
+                        self.columns.put(st)
+                    changed[key] = st
+        if len(changed) >= JOURNAL_COMPACT_THRESHOLD:
+            self.pending.setdefault("student", {}).update(changed)
+            self.save_in_bulk("student")
+        else:
+            for key, st in changed.items():
+                self.journal("student", "put", key, st)
+        print(f"Regraded {len(changed)} student(s).")
+        return len(changed)
+
+    @timed
+    @read_locked
+    def display_all_grades(self, sink=None):
+        self.write_report(self.table_rows("grades"), listing_lines("Grades Records", grade_line), sink)
     
     
     # Login CRUD & Functions
     # ----------------------
+    @timed
     def add_login_user(self, email_id, password, role):
-        if any(u.email_id == email_id for u in self.login_users):
+        with self.rwlock.read():
+            exists = email_id in self.login_index
+        if not exists:
+            # The slow password hash is computed before taking the write lock, as in validate_login.
+            user = LoginUser.from_row({"User_id": email_id, "Password": hash_password(password), "Role": role})
+            with self.rwlock.write():
+                exists = email_id in self.login_index  # Another thread may have added it meanwhile.
+                if not exists:
+                    self.login_index[email_id] = user
+                    self.journal("login", "put", email_id, user)
+        if exists:
             print("A login user with this email already exists.")
-            return
-        user = LoginUser(email_id, password, role)
-        self.login_users.append(user)
-        self.save_data()
-        print("Login user added successfully.")
+        else:
+            print("Login user added successfully.")
 
+    @timed
     def validate_login(self, email_id, password):
-        for u in self.login_users:
-            if u.email_id == email_id and u.decrypt_password() == password:
-                return True
-        return False
+        """
+        Looks the user up by User_id and checks the password in constant time. Recent successes are served
+        from the credential cache; a legacy or under-cost verifier is re-hashed after a successful login.
+        """
+        with self.rwlock.read():
+            user = self.login_index.get(email_id)
+            verifier = user.Password if user is not None else None
+        if user is None:
+            # Do the same work as a real check, so unknown users cannot be told apart by timing.
+            hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), bytes(16), PASSWORD_HASH_ITERATIONS)
+            return False
+        if self.login_cache.check(email_id, verifier, password):
+            return True
+        if not user.verify_password(password):
+            return False
+        if user.needs_rehash():
+            new_verifier = hash_password(password)  # Hashed before taking the write lock.
+            with self.rwlock.write():
+                if self.login_index.get(email_id) is user and user.Password == verifier:
+                    user.Password = new_verifier
+                    self.journal("login", "put", email_id, user)
+            verifier = user.Password
+        self.login_cache.add(email_id, verifier, password)
+        return True
+
+    
+    # Rankings (Top-k, Bottom-k, Percentile Cut-offs, Rank of a Student)
+    # ========================================================
+    def marks_index_for(self, course_id=None):
+        """Returns the marks order index for one course, or for all students when course_id is None."""
+        if course_id is None:
+            return self.marks_index
+        return self.course_marks.get(course_id, MarksIndex())
+
+    @read_locked
+    def top_students(self, k, course_id=None):
+        """Returns the k students with the highest marks, highest first, in O(k)."""
+        return [self.student_index[key] for key in self.marks_index_for(course_id).descending(k)]
+
+    @read_locked
+    def bottom_students(self, k, course_id=None):
+        """Returns the k students with the lowest marks, lowest first, in O(k)."""
+        return [self.student_index[key] for key in self.marks_index_for(course_id).ascending(k)]
+
+    @read_locked
+    def percentile_students(self, percent, course_id=None, top=False):
+        """Returns the bottom (or, with top=True, the top) `percent`% of students by marks, rounded up."""
+        if not 0 <= percent <= 100:
+            print("Percent must be between 0 and 100.")
+            return []
+        k = math.ceil(len(self.marks_index_for(course_id)) * percent / 100)
+        return self.top_students(k, course_id) if top else self.bottom_students(k, course_id)
+
+    @read_locked
+    def rank_of_student(self, email_address, course_id=None):
+        """Returns a student's 1-based rank by marks (overall or within course_id) in O(n / MarksIndex.BLOCK_SIZE)."""
+        index = self.marks_index_for(course_id)
+        if email_address not in index.sort_keys:
+            print("Student not found.")
+            return None
+        return index.rank(email_address)
 
     
     # Statistics Functions & Grouped Reports
     # ========================================================
+    @read_locked
     def calculate_course_statistics(self, course_id):
-        """Calculates and returns the average and median marks for students in a given course."""
-        marks_list = [float(s.Marks) for s in self.students if s.Course_id == course_id]
-        if not marks_list:
+        """Returns the average and median marks for students in a given course, read from the running aggregates."""
+        marks = self.course_marks.get(course_id)
+        if marks is None:
             print(f"No students found for course {course_id}.")
             return None, None
-        avg = sum(marks_list) / len(marks_list)
-        med = statistics.median(marks_list)
-        return avg, med
-
-    def report_by_course(self):
-        """Prints a report of each course with the list of enrolled students and course statistics."""
-        print("\n--- Course-wise Report ---")
-        for course in self.courses:
-            print(f"\nCourse: {course.Course_id} - {course.Course_name}")
-            enrolled = [s for s in self.students if s.Course_id == course.Course_id]
-            if enrolled:
-                for s in enrolled:
-                    print(f"   {s.First_name} {s.Last_name} | Marks: {s.Marks} | Grade: {s.grades}")
-                avg, med = self.calculate_course_statistics(course.Course_id)
-                print(f"   >> Average Marks: {avg:.2f} | Median Marks: {med:.2f}")
-            else:
-                print("   No students enrolled.")
-
-    def report_by_professor(self):
-        """Prints a report for each professor showing the course they teach and the students enrolled."""
-        print("\n--- Professor-wise Report ---")
-        for prof in self.professors:
-            print(f"\nProfessor: {prof.Professor_id} - {prof.Professor_Name} ({prof.Rank})")
-            course = next((c for c in self.courses if c.Course_id == prof.Course_id), None)
-            if course:
-                print(f"   Teaches Course: {course.Course_id} - {course.Course_name}")
-                enrolled = [s for s in self.students if s.Course_id == course.Course_id]
-                if enrolled:
-                    for s in enrolled:
-                        print(f"      {s.First_name} {s.Last_name} | Marks: {s.Marks} | Grade: {s.grades}")
-                else:
-                    print("      No students enrolled.")
+        return marks.mean(), marks.median()
+
+    @read_locked
+    def course_summary(self, course_id):
+        """Returns count, mean, median, std-dev, min and max marks for a course (None if nobody is enrolled)."""
+        marks = self.course_marks.get(course_id)
+        if marks is None:
+            return None
+        return {
+            "count": len(marks),
+            "mean": marks.mean(),
+            "median": marks.median(),
+            "stdev": marks.stdev(),
+            "min": marks.minimum(),
+            "max": marks.maximum()
+        }
+
+    @read_locked
+    def course_percentile(self, course_id, percent):
+        """Returns the marks at the given percentile (0-100) of a course, or None if nobody is enrolled."""
+        marks = self.course_marks.get(course_id)
+        if marks is None:
+            return None
+        return marks.quantile(percent / 100)
+
+    @read_locked
+    def grade_histogram(self, course_id=None):
+        """Returns {grade: number of students}, overall or for one course."""
+        if self.columns is not None:
+            return self.columns.grade_histogram(course_id)
+        students = self.student_index.values() if course_id is None else self.students_in_course(course_id)
+        return dict(Counter(s.grades for s in students))
+
+    def write_report(self, rows, format_lines, sink=None):
+        """Streams report rows into a sink (see StdoutSink, PagedSink, CsvSink, JsonLinesSink); stdout by default."""
+        (sink if sink is not None else StdoutSink()).write(rows, format_lines)
+
+    def table_rows(self, table):
+        """Yields a table's records as rows, walking its index rather than copying it into a list."""
+        for entity in getattr(self, TABLES[table][3]).values():
+            yield entity.to_dict()
+
+    def course_report_rows(self):
+        """Yields one row per enrolled student of each course (student fields None for an empty course)."""
+        # With the columnar store, every course's aggregates come from one vectorized group-by.
+        course_stats = self.columns.course_statistics() if self.columns is not None else None
+        for course in self.course_index.values():
+            row = {"Course_id": course.Course_id, "Course_name": course.Course_name, "Email_address": None,
+                   "First_name": None, "Last_name": None, "Marks": None, "grades": None, "Average": None, "Median": None}
+            enrolled = self.course_students.get(course.Course_id)
+            if not enrolled:
+                yield row
+                continue
+            if course_stats is not None:
+                _, row["Average"], row["Median"] = course_stats[course.Course_id]
             else:
-                print("   No course found for this professor.")
+                row["Average"], row["Median"] = self.calculate_course_statistics(course.Course_id)
+            for s in enrolled.values():
+                yield dict(row, Email_address=s.Email_address, First_name=s.First_name, Last_name=s.Last_name,
+                           Marks=s.Marks, grades=s.grades)
+
+    def professor_report_rows(self):
+        """
+        Yields one row per student taught by each professor. Course_name is None when the professor's
+        course does not exist, and the student fields are None when nobody is enrolled.
+        """
+        for prof in self.professor_index.values():
+            row = {"Professor_id": prof.Professor_id, "Professor Name": prof.Professor_Name, "Rank": prof.Rank,
+                   "Course_id": prof.Course_id, "Course_name": None, "Email_address": None,
+                   "First_name": None, "Last_name": None, "Marks": None, "grades": None}
+            course = self.course_index.get(prof.Course_id)
+            if course is None:
+                yield row
+                continue
+            row["Course_name"] = course.Course_name
+            enrolled = self.course_students.get(course.Course_id)
+            if not enrolled:
+                yield row
+                continue
+            for s in enrolled.values():
+                yield dict(row, Email_address=s.Email_address, First_name=s.First_name, Last_name=s.Last_name,
+                           Marks=s.Marks, grades=s.grades)
 
-    def report_by_student(self):
-        """Prints each student's record."""
-        print("\n--- Student-wise Report ---")
-        for s in self.students:
-            s.display()
+    @timed
+    @read_locked
+    def report_by_course(self, sink=None):
+        """Reports each course with its enrolled students and course statistics."""
+        self.write_report(self.course_report_rows(), course_report_lines, sink)
+
+    @timed
+    @read_locked
+    def report_by_professor(self, sink=None):
+        """Reports each professor with the course they teach and the students enrolled."""
+        self.write_report(self.professor_report_rows(), professor_report_lines, sink)
+
+    @timed
+    @read_locked
+    def report_by_student(self, sink=None):
+        """Reports each student's record."""
+        self.write_report(self.table_rows("student"), listing_lines("Student-wise Report", student_line), sink)
     
     
     # (Additional reports can be added as needed.)
     # -------------------------------------------------------
 
+
+# Asyncio HTTP/JSON Service
+# ============================================================
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+SERVICE_FLUSH_INTERVAL = 5.0   # Seconds between background journal group commits (app.flush()) while there are new changes.
+HTTP_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 409: "Conflict", 500: "Internal Server Error"}
+
+def valid_marks(value):
+    try:
+        parse_marks(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+class GradeService:
+    """
+    Local HTTP/1.1 JSON front-end for a CheckMyGradeApp, built on asyncio streams (keep-alive supported):
+
+        GET    /students?q=term[&prefix=1]   search students
+        GET    /students/<email>             one student
+        POST   /students                     add (body keyed by the Student.csv headers)
+        PATCH  /students/<email>             update (First_name, Last_name, Course.id, grades, Marks)
+        DELETE /students/<email>             delete
+        GET    /courses/<course_id>/stats    course_summary()
+        POST   /login                        {"User_id": ..., "Password": ...} -> {"valid": bool}
+        POST   /flush                        save_data() now
+        GET    /metrics                      METRICS.to_json()
+
+    App calls run on a thread pool (the app's reader-writer lock keeps them safe) and flushes run
+    on their own single-thread executor, so the event loop never blocks on the app or the disk.
+    Every flush_interval the journal is group-committed with app.flush(); the tables are only
+    rewritten when the journal reaches its compaction threshold, on POST /flush and on stop().
+    """
+    def __init__(self, app, workers=8, flush_interval=SERVICE_FLUSH_INTERVAL):
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.flush_executor = ThreadPoolExecutor(max_workers=1)
+        self.flush_interval = flush_interval
+        self.server = None
+
+    async def start(self, host=SERVICE_HOST, port=SERVICE_PORT, unix_path=None):
+        """Starts listening on host:port (port 0 picks a free port) or on a Unix socket; returns the bound address."""
+        if unix_path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path=unix_path)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port)
+        self.flusher = asyncio.get_running_loop().create_task(self.flush_periodically())
+        return self.server.sockets[0].getsockname()
+
+    async def stop(self):
+        """Stops accepting requests and writes any unsaved changes."""
+        self.flusher.cancel()
+        self.server.close()
+        await self.server.wait_closed()
+        await self.flush()
+        self.executor.shutdown()
+        self.flush_executor.shutdown()
+
+    async def serve_forever(self, host=SERVICE_HOST, port=SERVICE_PORT, unix_path=None):
+        address = await self.start(host, port, unix_path)
+        print(f"CheckMyGrade service listening on {address}")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def flush(self):
+        await asyncio.get_running_loop().run_in_executor(self.flush_executor, self.app.save_data)
+
+    async def flush_periodically(self):
+        committed = None   # app.journal_entries at the last group commit.
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self.app.journal_queue or self.app.save_requested or self.app.journal_entries != committed:
+                committed = self.app.journal_entries
+                await asyncio.get_running_loop().run_in_executor(self.flush_executor, self.app.flush)
+
+    async def handle(self, reader, writer):
+        """Serves the HTTP requests of one connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, payload = await self.dispatch(method, target, body)
+                data = json.dumps(payload).encode('utf-8')
+                close = headers.get('connection', '').lower() == 'close'
+                writer.write((f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                              f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                              f"{'Connection: close' if close else 'Connection: keep-alive'}\r\n\r\n").encode('latin-1') + data)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # Client went away or sent a malformed request; drop the connection.
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        """Routes one request; returns (HTTP status, JSON-serializable payload)."""
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.split('/') if p]
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {"error": "request body is not valid JSON"}
+
+        if parts == ["flush"] and method == "POST":
+            await self.flush()
+            return 200, {"saved": True}
+        routes = {
+            ("GET", "students", 1): lambda: self.search_students(query.get("q", ""), query.get("prefix") == "1"),
+            ("POST", "students", 1): lambda: self.add_student(data),
+            ("GET", "students", 2): lambda: self.get_student(parts[1]),
+            ("PATCH", "students", 2): lambda: self.update_student(parts[1], data),
+            ("DELETE", "students", 2): lambda: self.delete_student(parts[1]),
+            ("POST", "login", 1): lambda: self.validate_login(data),
+            ("GET", "metrics", 1): lambda: (200, METRICS.to_json()),
+        }
+        if len(parts) == 3 and parts[0] == "courses" and parts[2] == "stats" and method == "GET":
+            handler = lambda: self.course_stats(parts[1])
+        elif parts and (method, parts[0], len(parts)) in routes:
+            handler = routes[(method, parts[0], len(parts))]
+        elif parts and any(key[1:] == (parts[0], len(parts)) for key in routes):
+            return 405, {"error": f"{method} not allowed on {url.path}"}
+        else:
+            return 404, {"error": f"no route for {url.path}"}
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, handler)
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    # Handlers (run on the thread pool)
+    # ----------------------
+    def search_students(self, term, prefix):
+        return 200, {"students": [s.to_dict() for s in self.app.search_students(term, prefix=prefix)]}
+
+    def get_student(self, email):
+        st = self.app.student_index.get(email)
+        if st is None:
+            return 404, {"error": f"student {email} not found"}
+        return 200, st.to_dict()
+
+    def add_student(self, data):
+        missing = [h for h in STUDENT_HEADERS if h not in data]
+        if missing:
+            return 400, {"error": "missing " + ", ".join(missing)}
+        bad_field = non_string_field(**{h: data[h] for h in STUDENT_HEADERS if h != "Marks"})
+        if bad_field is not None:
+            return 400, {"error": f"{bad_field} must be a string"}
+        if not valid_marks(data["Marks"]):
+            return 400, {"error": f"invalid marks {data['Marks']!r}"}
+        email = data["Email_address"]
+        # The write lock is re-entrant, so the existence check and the add happen atomically.
+        with self.app.rwlock.write():
+            if email in self.app.student_index:
+                return 409, {"error": f"student {email} already exists"}
+            self.app.add_student(data["First_name"], data["Last_name"], email, data["Course.id"],
+                                 data["grades"], str(data["Marks"]))
+            return 201, self.app.student_index[email].to_dict()
+
+    def update_student(self, email, data):
+        fields = {"First_name": "First_name", "Last_name": "Last_name", "Course.id": "Course_id",
+                  "grades": "grades", "Marks": "Marks"}
+        bad_field = non_string_field(**{name: value for name, value in data.items() if name in fields and name != "Marks"})
+        if bad_field is not None:
+            return 400, {"error": f"{bad_field} must be a string"}
+        kwargs = {fields[name]: str(value) if name == "Marks" else value
+                  for name, value in data.items() if name in fields}
+        if "Marks" in kwargs and not valid_marks(kwargs["Marks"]):
+            return 400, {"error": f"invalid marks {data['Marks']!r}"}
+        with self.app.rwlock.write():
+            st = self.app.student_index.get(email)
+            if st is None:
+                return 404, {"error": f"student {email} not found"}
+            self.app.update_student(email, **kwargs)
+            return 200, st.to_dict()
+
+    def delete_student(self, email):
+        with self.app.rwlock.write():
+            if email not in self.app.student_index:
+                return 404, {"error": f"student {email} not found"}
+            self.app.delete_student(email)
+            return 200, {"deleted": email}
+
+    def course_stats(self, course_id):
+        summary = self.app.course_summary(course_id)
+        if summary is None:
+            return 404, {"error": f"no students enrolled in {course_id}"}
+        return 200, dict(summary, course_id=course_id)
+
+    def validate_login(self, data):
+        return 200, {"valid": self.app.validate_login(data.get("User_id", ""), data.get("Password", ""))}
+
+class GradeServiceClient:
+    """Minimal keep-alive HTTP/JSON client for GradeService, for local testing and load generation."""
+    def __init__(self, host=SERVICE_HOST, port=SERVICE_PORT, unix_path=None):
+        self.host, self.port, self.unix_path = host, port, unix_path
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        """Sends one request; returns (HTTP status, decoded JSON body)."""
+        if self.writer is None:
+            if self.unix_path is not None:
+                self.reader, self.writer = await asyncio.open_unix_connection(self.unix_path)
+            else:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n\r\n"
+                          .encode('latin-1') + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+def run_service(host=SERVICE_HOST, port=SERVICE_PORT, unix_path=None):
+    with CheckMyGradeApp(write_behind=True) as app:
+        try:
+            asyncio.run(GradeService(app).serve_forever(host, port, unix_path))
+        except KeyboardInterrupt:
+            print("Service stopped.")
+
+# Benchmark Suite
+# ============================================================
+# Times the main operations on synthetic tables of each size with time.perf_counter: every case runs
+# BENCHMARK_WARMUP untimed rounds, then BENCHMARK_REPEAT timed ones. Each size runs in its own temporary
+# directory, so the real CSV files are never touched. Results are JSON, and a previous run's JSON can be
+# given as a baseline: a case whose median slowed down by more than the tolerance is a regression.
+BENCHMARK_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+BENCHMARK_REPEAT = 5
+BENCHMARK_WARMUP = 1
+BENCHMARK_BATCH = 100        # add/update/delete cases time this many calls per round.
+BENCHMARK_TOLERANCE = 0.20   # Allowed slowdown of a median against the baseline (0.20 = 20%).
+
+def write_benchmark_tables(students, courses=50):
+    """Writes synthetic Student, Course and Professor CSVs into the current directory."""
+    save_csv(STUDENT_FILE, ({"Email_address": f"student{i}@example.com", "First_name": f"First{i}",
+                             "Last_name": f"Last{i}", "Course.id": f"CS{i % courses}",
+                             "grades": "ABCDF"[i % 5], "Marks": i % 101} for i in range(students)),
+             STUDENT_HEADERS, rotate=False)
+    save_csv(COURSE_FILE, ({"Course_id": f"CS{c}", "Course_name": f"Course {c}", "Description": "Synthetic"}
+                           for c in range(courses)), COURSE_HEADERS, rotate=False)
+    save_csv(PROFESSOR_FILE, ({"Professor_id": f"prof{c}@example.com", "Professor Name": f"Professor {c}",
+                               "Rank": "Professor", "Course.id": f"CS{c}"} for c in range(courses)),
+             PROFESSOR_HEADERS, rotate=False)
+
+def benchmark_cases(app, students, report_stream):
+    """
+    Returns [(name, calls per round, function running one round)] for an app holding `students`
+    students; the reports are written to report_stream.
+    """
+    new_emails = (f"bench{i}@example.com" for i in range(10 ** 9))
+    added = []
+    updates = iter(range(10 ** 9))
+
+    def load():
+        CheckMyGradeApp().load_table("student")
+
+    def save():
+        app.mark_dirty("student")
+        app.save_data()
+
+    def add():
+        for _ in range(BENCHMARK_BATCH):
+            email = next(new_emails)
+            app.add_student("Bench", "Student", email, "CS0", "A", "75")
+            added.append(email)
+
+    def update():
+        for _ in range(BENCHMARK_BATCH):
+            i = next(updates)
+            app.update_student(f"student{i * 7919 % students}@example.com", Marks=str(i % 101))
+
+    def delete():
+        # Removes the students add() created, one batch per round.
+        for _ in range(BENCHMARK_BATCH):
+            app.delete_student(added.pop())
+
+    def course_statistics():
+        for course_id in app.course_marks:
+            app.course_summary(course_id)
+        app.grade_histogram()
+
+    return [("load", 1, load), ("save", 1, save),
+            ("add_student", BENCHMARK_BATCH, add), ("update_student", BENCHMARK_BATCH, update),
+            ("delete_student", BENCHMARK_BATCH, delete),
+            ("search", 1, lambda: app.search_students("First12")),
+            ("sort", 1, lambda: app.sort_students_by_marks(reverse=True)),
+            ("statistics", 1, course_statistics),
+            ("report_by_course", 1, lambda: app.report_by_course(StdoutSink(report_stream))),
+            ("report_by_professor", 1, lambda: app.report_by_professor(StdoutSink(report_stream)))]
+
+def time_benchmark(run, calls=1, repeat=BENCHMARK_REPEAT, warmup=BENCHMARK_WARMUP):
+    """Runs a case warmup + repeat times; returns seconds per call of the timed rounds (min, median, mean, stdev)."""
+    for _ in range(warmup):
+        run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) / calls)
+    return {"min": min(times), "median": statistics.median(times), "mean": statistics.fmean(times),
+            "stdev": statistics.stdev(times) if len(times) > 1 else 0.0, "repeat": repeat}
+
+def compare_benchmarks(results, baseline, tolerance=BENCHMARK_TOLERANCE):
+    """Returns [(case, size, median, baseline median, ratio)] for every case slower than the baseline allows."""
+    regressions = []
+    for name, sizes in results.items():
+        for size, timing in sizes.items():
+            old = baseline.get(name, {}).get(size)
+            if old is None or old["median"] <= 0:
+                continue
+            ratio = timing["median"] / old["median"]
+            if ratio > 1 + tolerance:
+                regressions.append((name, size, timing["median"], old["median"], ratio))
+    return regressions
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, repeat=BENCHMARK_REPEAT, warmup=BENCHMARK_WARMUP,
+                   output=None, baseline=None, tolerance=BENCHMARK_TOLERANCE):
+    """
+    Runs every benchmark case at each size and returns the JSON-ready report; with `output` it is
+    also written there, and with `baseline` (a previous report's file) regressions are listed in it.
+    """
+    results = {}
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="checkmygrade-bench-")
+    try:
+        with open(os.devnull, mode='w') as devnull:
+            for size in sizes:
+                os.chdir(workdir)
+                os.mkdir(str(size))
+                os.chdir(str(size))
+                write_benchmark_tables(size)
+                # The app's own messages (and the reports) go to /dev/null while it is timed.
+                with contextlib.redirect_stdout(devnull):
+                    app = CheckMyGradeApp()
+                    app.load_data()
+                for name, calls, run in benchmark_cases(app, size, devnull):
+                    with contextlib.redirect_stdout(devnull):
+                        timing = time_benchmark(run, calls, repeat, warmup)
+                    results.setdefault(name, {})[str(size)] = timing
+                    print(f"{size:>9,} students | {name:<20} median {timing['median'] * 1000:10.3f} ms")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "repeat": repeat, "warmup": warmup, "results": results}
+    if baseline is not None:
+        with open(baseline) as f:
+            regressions = compare_benchmarks(results, json.load(f)["results"], tolerance)
+        report["regressions"] = [{"case": name, "size": int(size), "median": median,
+                                  "baseline_median": old, "ratio": ratio}
+                                 for name, size, median, old, ratio in regressions]
+        for name, size, median, old, ratio in regressions:
+            print(f"REGRESSION {name} at {size} students: {median * 1000:.3f} ms vs {old * 1000:.3f} ms ({ratio:.2f}x)")
+        if not regressions:
+            print(f"No regressions against {baseline} (tolerance {tolerance:.0%}).")
+    if output is not None:
+        with open(output, mode='w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
 # ============================================================
 # Unit Tests
 # ============================================================
 class TestCheckMyGradeApp(unittest.TestCase):
     def setUp(self):
+        # Every test works on fresh tables in a temporary directory, never on the real CSV files.
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
         self.app = CheckMyGradeApp()
         # Clear in-memory lists for fresh tests:
         self.app.students = []
@@ -584,6 +3153,10 @@ class TestCheckMyGradeApp(unittest.TestCase):
         self.app.grades_list = []
         self.app.login_users = []
 
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
     def test_add_and_search_student(self):
         print("\n=== Running test_add_and_search_student ===")
         self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "90")
@@ -597,7 +3170,7 @@ class TestCheckMyGradeApp(unittest.TestCase):
         self.app.update_student("david@example.com", First_name="Dave", Marks="88")
         results = self.app.search_students("david")
         self.assertEqual(results[0].First_name, "Dave")
-        self.assertEqual(results[0].Marks, "88")
+        self.assertEqual(results[0].Marks, 88)
 
     def test_sort_students_by_marks(self):
         print("\n=== Running test_sort_students_by_marks ===")
@@ -607,34 +3180,46 @@ class TestCheckMyGradeApp(unittest.TestCase):
         self.assertEqual(sorted_students[0].Email_address, "bob@example.com")
         self.assertEqual(sorted_students[1].Email_address, "charlie@example.com")
 
-    def test_large_number_of_students_and_search_timing(self):
-        print("\n=== Running test_large_number_of_students_and_search_timing ===")
+    # Timings live in the benchmark suite (run_benchmarks); these tests only check results.
+    def test_large_number_of_students_and_search(self):
+        print("\n=== Running test_large_number_of_students_and_search ===")
         self.app.students = []
-        # Use 100 dummy records for easier timing display.
         for i in range(100):
             self.app.add_student(f"First{i}", f"Last{i}", f"student{i}@example.com", "CS101", "A", str(70 + (i % 30)))
-        print("Finished adding 100 dummy student records.")
-        start_time = time.time()
         results = self.app.search_students("student")
-        end_time = time.time()
-        total_search_time = end_time - start_time
-        print(f"Total time taken for searching 100 records: {total_search_time:.4f} seconds")
-        self.assertTrue(len(results) >= 100)
+        self.assertEqual(len(results), 100)
+        self.assertEqual([s.Email_address for s in self.app.search_students("First42")], ["student42@example.com"])
 
-    def test_sorting_timing(self):
-        print("\n=== Running test_sorting_timing ===")
+    def test_sorting_many_students(self):
+        print("\n=== Running test_sorting_many_students ===")
         self.app.students = []
         for i in range(100):
             self.app.add_student(f"First{i}", f"Last{i}", f"student{i}@example.com", "CS101", "A", str(70 + i))
-        start_time = time.time()
         sorted_students_asc = self.app.sort_students_by_marks(reverse=False)
-        asc_time = time.time() - start_time
-        print(f"Sorting (ascending) 100 records took: {asc_time:.4f} seconds")
-        start_time = time.time()
         sorted_students_desc = self.app.sort_students_by_marks(reverse=True)
-        desc_time = time.time() - start_time
-        print(f"Sorting (descending) 100 records took: {desc_time:.4f} seconds")
-        self.assertEqual(sorted_students_asc[0].Marks, "70")
+        self.assertEqual([s.Marks for s in sorted_students_asc], list(range(70, 170)))
+        self.assertEqual(sorted_students_desc, sorted_students_asc[::-1])
+
+    def test_benchmark_suite(self):
+        print("\n=== Running test_benchmark_suite ===")
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "bench.json")
+            report = run_benchmarks(sizes=[300], repeat=2, warmup=1, output=output)
+            self.assertEqual(os.getcwd(), cwd)
+            self.assertEqual(set(report["results"]), {"load", "save", "add_student", "update_student", "delete_student",
+                                                      "search", "sort", "statistics", "report_by_course",
+                                                      "report_by_professor"})
+            self.assertEqual(report["results"]["sort"]["300"]["repeat"], 2)
+            with open(output) as f:
+                self.assertEqual(json.load(f)["results"].keys(), report["results"].keys())
+            # A case twice as slow as its baseline is a regression; one within tolerance is not.
+            fast = {"sort": {"300": {"median": 0.5}}, "search": {"300": {"median": 1.1}}}
+            slow = {"sort": {"300": {"median": 1.0}}, "search": {"300": {"median": 1.0}}}
+            self.assertEqual(compare_benchmarks(slow, fast), [("sort", "300", 1.0, 0.5, 2.0)])
+            baseline = run_benchmarks(sizes=[300], repeat=1, warmup=0, baseline=output)
+            self.assertIn("regressions", baseline)
+
 
     def test_course_crud(self):
         print("\n=== Running test_course_crud ===")
@@ -671,6 +3256,52 @@ class TestCheckMyGradeApp(unittest.TestCase):
         self.assertEqual(grade_record[0].Grade, "A+")
         self.assertEqual(grade_record[0].Marks_range, "95-100")
 
+    def test_grade_bands_and_regrading(self):
+        print("\n=== Running test_grade_bands_and_regrading ===")
+        self.app.add_student("Ann", "Lee", "ann@example.com", "CS101", "?", "95")
+        self.app.add_student("Ben", "Ray", "ben@example.com", "CS101", "?", "89.5")
+        self.app.add_student("Cal", "Fox", "cal@example.com", "CS202", "?", "72")
+        self.assertEqual(self.app.regrade_all(), 0)  # No bands yet.
+        self.app.add_grade("G1", "A", "90-100")
+        self.app.add_grade("G2", "B", "80-89")
+        self.app.add_grade("G3", "C", "70-79")
+        self.app.add_grade("G4", "X", "not a range")  # Rejected.
+        self.assertNotIn("G4", self.app.grade_index)
+        # Each new band regraded only the students inside it; 89.5 falls in "80-89".
+        self.assertEqual([s.grades for s in self.app.students], ["A", "B", "C"])
+
+        problems = GradeBands([Grades("G1", "A", "90-100"), Grades("G2", "B", "85-95"),
+                               Grades("G3", "C", "70-79"), Grades("G4", "D", "x")]).problems
+        self.assertEqual(problems, ["G4: invalid marks range 'x'", "gap between G3 and G2", "G2 and G1 overlap"])
+
+        self.app.update_student("ann@example.com", Marks="75")
+        self.assertEqual(self.app.student_index["ann@example.com"].grades, "C")
+        self.app.update_student("ann@example.com", Marks="95", grades="A+")  # An explicit grade wins.
+        self.assertEqual(self.app.student_index["ann@example.com"].grades, "A+")
+
+        # Only students in the changed band are re-evaluated.
+        self.app.student_index["cal@example.com"].grades = "stale"
+        self.app.modify_grade("G2", Grade="B+")
+        self.assertEqual(self.app.student_index["ben@example.com"].grades, "B+")
+        self.assertEqual(self.app.student_index["cal@example.com"].grades, "stale")
+        self.assertEqual(self.app.regrade_course("CS202"), 1)
+        self.assertEqual(self.app.student_index["cal@example.com"].grades, "C")
+        # A band change that leaves a gap is refused until the bands are consistent again.
+        self.app.modify_grade("G2", Marks_range="82-88")
+        self.assertEqual(self.app.regrade_all(), 0)
+        self.app.modify_grade("G2", Marks_range="80-89")  # Consistent again, so everyone is regraded,
+        self.assertEqual(self.app.student_index["ann@example.com"].grades, "A")  # overriding Ann's "A+".
+        self.assertEqual(self.app.regrade_all(), 0)
+        reloaded = CheckMyGradeApp().student_index
+        self.assertEqual([reloaded[e].grades for e in ("ann@example.com", "ben@example.com", "cal@example.com")],
+                         ["A", "B+", "C"])
+        # Marks outside every band, or in a deleted band, leave no grade rather than a stale letter.
+        self.app.update_student("cal@example.com", Marks="50")
+        self.assertEqual(self.app.student_index["cal@example.com"].grades, "")
+        self.app.delete_grade("G1")
+        self.assertEqual(self.app.student_index["ann@example.com"].grades, "")
+        self.assertEqual(self.app.student_index["ben@example.com"].grades, "B+")
+
     def test_course_statistics(self):
         print("\n=== Running test_course_statistics ===")
         self.app.students = []
@@ -700,6 +3331,687 @@ class TestCheckMyGradeApp(unittest.TestCase):
         self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "95")
         self.app.report_by_professor()
 
+    def test_report_sinks(self):
+        print("\n=== Running test_report_sinks ===")
+        self.app.add_course("CS101", "Intro to CS", "Basic CS course")
+        self.app.add_course("CS102", "Data Structures", "No students yet")
+        self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "95")
+        self.app.add_student("Bob", "Brown", "bob@example.com", "CS101", "B", "85")
+        out = io.StringIO()
+        self.app.report_by_course(StdoutSink(out))
+        self.assertEqual(out.getvalue().splitlines()[2:], [
+            "", "Course: CS101 - Intro to CS",
+            "   Alice Smith | Marks: 95 | Grade: A",
+            "   Bob Brown | Marks: 85 | Grade: B",
+            "   >> Average Marks: 90.00 | Median Marks: 90.00",
+            "", "Course: CS102 - Data Structures",
+            "   No students enrolled."])
+        self.app.report_by_course(CsvSink("test_report.csv"))
+        rows = load_csv("test_report.csv", [])
+        self.assertEqual([(r["Course_id"], r["Email_address"], r["Average"]) for r in rows],
+                         [("CS101", "alice@example.com", "90.0"), ("CS101", "bob@example.com", "90.0"), ("CS102", "", "")])
+        self.app.display_all_students(JsonLinesSink("test_report.jsonl"))
+        with open("test_report.jsonl") as f:
+            self.assertEqual([json.loads(line)["Marks"] for line in f], [95, 85])
+        # Paging stops as soon as the reader quits.
+        out = io.StringIO()
+        self.app.report_by_student(PagedSink(page_size=2, stream=out, prompt=lambda message: "q"))
+        self.assertEqual(out.getvalue().splitlines()[1:], ["--- Student-wise Report ---",
+                                                            "Alice Smith | Email: alice@example.com | Course: CS101 | grades: A | Marks: 95"])
+        os.remove("test_report.csv")
+        os.remove("test_report.jsonl")
+
+    def test_journal_replay(self):
+        print("\n=== Running test_journal_replay ===")
+        self.app.mark_dirty()
+        self.app.save_data()
+        self.app.add_student("Jack", "Frost", "jack@example.com", "CS101", "B", "82")
+        self.app.update_student("jack@example.com", Marks="84")
+        self.app.add_course("JRN101", "Journaling", "Replay test course")
+        self.app.delete_course("JRN101")
+        self.assertEqual(self.app.journal_entries, 4)
+        # The CSV snapshot is untouched until compaction; a fresh load replays the journal.
+        self.assertEqual(len(load_csv(STUDENT_FILE, STUDENT_HEADERS)), 0)
+        reloaded = CheckMyGradeApp()
+        jack = [s for s in reloaded.students if s.Email_address == "jack@example.com"]
+        self.assertEqual(jack[0].Marks, 84)
+        self.assertFalse(any(c.Course_id == "JRN101" for c in reloaded.courses))
+        reloaded.compact_journal()
+        self.assertEqual(os.path.getsize(JOURNAL_FILE), 0)
+        rows = load_csv(STUDENT_FILE, STUDENT_HEADERS)
+        self.assertIn({"Email_address": "jack@example.com", "First_name": "Jack", "Last_name": "Frost",
+                       "Course.id": "CS101", "grades": "B", "Marks": "84"}, rows)
+
+    def test_save_data_writes_only_dirty_tables(self):
+        print("\n=== Running test_save_data_writes_only_dirty_tables ===")
+        self.app.save_data()
+        student_mtime = os.stat(STUDENT_FILE).st_mtime_ns
+        self.app.add_grade("G9", "B", "80-89")
+        self.assertEqual(self.app.dirty_tables, {"grades"})
+        self.app.save_data()
+        self.assertEqual(self.app.dirty_tables, set())
+        self.assertEqual(os.stat(STUDENT_FILE).st_mtime_ns, student_mtime)
+        self.assertIn("G9", [row["Grade_id"] for row in load_csv(GRADES_FILE, GRADES_HEADERS)])
+        self.assertEqual([name for name in os.listdir() if name.endswith('.tmp')], [])
+
+    def test_concurrent_sessions_merge(self):
+        print("\n=== Running test_concurrent_sessions_merge ===")
+        self.app.save_data()
+        a, b = CheckMyGradeApp(), CheckMyGradeApp()
+        a.ensure_loaded("student")
+        b.ensure_loaded("student")
+        a.add_student("Ann", "Lee", "ann@example.com", "CS101", "A", "91")
+        # b saves first and folds in a's journaled add instead of overwriting it.
+        b.add_students_bulk([{"Email_address": "ben@example.com", "First_name": "Ben", "Last_name": "Ray",
+                              "Course.id": "CS101", "grades": "B", "Marks": "82"}])
+        self.assertIn("ann@example.com", b.student_index)
+        # a's copy is now older than the saved table, so a merges b's bulk add before saving.
+        a.update_student("ann@example.com", Marks="93")
+        self.assertNotEqual(a.table_versions["student"], read_versions()["student"])
+        a.save_data()
+        self.assertEqual(a.table_versions["student"], read_versions()["student"])
+        emails = [row["Email_address"] for row in load_csv(STUDENT_FILE, STUDENT_HEADERS)]
+        self.assertIn("ann@example.com", emails)
+        self.assertIn("ben@example.com", emails)
+        self.assertEqual(CheckMyGradeApp().student_index["ann@example.com"].Marks, 93)
+
+    def test_sessions_after_journal_truncation(self):
+        print("\n=== Running test_sessions_after_journal_truncation ===")
+        x = CheckMyGradeApp()
+        for i in range(5):
+            x.add_course(f"X10{i}", "Padding", "Grows the journal")
+        b = CheckMyGradeApp()
+        b.ensure_loaded("student")       # b's journal offset is past x's entries.
+        a = CheckMyGradeApp()
+        a.add_course("A101", "Truncates", "Saving empties the journal")
+        a.save_data()
+        c = CheckMyGradeApp()
+        c.add_student("Carl", "Cole", "carl@e.com", "A101", "B", "80")   # Lands below b's stale offset.
+        c.close()
+        b.add_course("B101", "Saves", "Must keep c's journaled student")
+        b.save_data()
+        self.assertIn("carl@e.com", CheckMyGradeApp().student_index)
+
+    def test_thread_safety_stress(self):
+        print("\n=== Running test_thread_safety_stress ===")
+        self.app.add_students_bulk({"Email_address": f"t{i}@example.com", "First_name": f"T{i}", "Last_name": "Base",
+                                    "Course.id": f"T{i % 3}", "grades": "A", "Marks": str(50 + i % 50)} for i in range(300))
+        errors = []
+
+        def reader():
+            try:
+                for i in range(40):
+                    self.app.search_students(f"t{i}@")
+                    self.app.calculate_course_statistics("T1")
+                    self.app.report_by_course(StdoutSink(io.StringIO()))
+                    self.app.top_students(5, course_id="T2")
+            except Exception as e:
+                errors.append(e)
+
+        def writer(n):
+            try:
+                for i in range(40):
+                    email = f"w{n}_{i}@example.com"
+                    self.app.add_student("W", str(n), email, f"T{i % 3}", "B", str(i))
+                    self.app.update_student(email, Course_id=f"T{(i + 1) % 3}", Marks=str(100 - i))
+                    if i % 2:
+                        self.app.delete_student(email)
+                    if i % 10 == 0:
+                        self.app.save_data()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=reader) for _ in range(6)] + [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        # Switch threads far more often than the default 5 ms so unsynchronized access would show up.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(errors, [])
+        # 300 bulk rows plus the 20 students each writer kept; every index agrees with the primary-key index.
+        self.assertEqual(len(self.app.student_index), 380)
+        self.assertEqual(sum(len(v) for v in self.app.course_students.values()), 380)
+        self.assertEqual(len(self.app.marks_index), 380)
+        self.assertEqual(self.app.course_marks["T1"].total, sum(s.Marks for s in self.app.students_in_course("T1")))
+
+    def test_grade_service(self):
+        print("\n=== Running test_grade_service ===")
+        self.app.add_course("SVC101", "Services", "Async front-end")
+
+        async def scenario():
+            service = GradeService(self.app, flush_interval=60)
+            _, port = await service.start(port=0)
+            client = GradeServiceClient(port=port)
+            try:
+                student = {"Email_address": "svc@example.com", "First_name": "Sol", "Last_name": "Vance",
+                           "Course.id": "SVC101", "grades": "A", "Marks": 88}
+                self.assertEqual((await client.request("POST", "/students", student))[0], 201)
+                self.assertEqual((await client.request("POST", "/students", student))[0], 409)
+                self.assertEqual((await client.request("POST", "/students", dict(student, Email_address="x@example.com",
+                                                                                   Marks="abc")))[0], 400)
+                # A non-string field is rejected up front instead of leaving a half-indexed student.
+                self.assertEqual((await client.request("POST", "/students", dict(student, Email_address="y@example.com",
+                                                                                   First_name=5)))[0], 400)
+                self.assertNotIn("y@example.com", self.app.student_index)
+                self.assertEqual((await client.request("PATCH", "/students/svc@example.com", {"Last_name": ["V"]}))[0], 400)
+                status, body = await client.request("GET", "/students?q=vance")
+                self.assertEqual([s["Email_address"] for s in body["students"]], ["svc@example.com"])
+                status, body = await client.request("PATCH", "/students/svc@example.com", {"Marks": 92})
+                self.assertEqual((status, body["Marks"]), (200, 92))
+                status, body = await client.request("GET", "/courses/SVC101/stats")
+                self.assertEqual((status, body["count"], body["mean"]), (200, 1, 92))
+                self.assertEqual((await client.request("POST", "/flush"))[0], 200)
+                self.assertIn("svc@example.com", [r["Email_address"] for r in load_csv(STUDENT_FILE, STUDENT_HEADERS)])
+                self.assertEqual((await client.request("DELETE", "/students/svc@example.com"))[0], 200)
+                self.assertEqual((await client.request("GET", "/students/svc@example.com"))[0], 404)
+                self.assertEqual((await client.request("PUT", "/students/svc@example.com"))[0], 405)
+                self.app.add_login_user("svc@example.com", "secret", "student")
+                status, body = await client.request("POST", "/login", {"User_id": "svc@example.com", "Password": "secret"})
+                self.assertEqual(body, {"valid": True})
+                # Requests on several connections are served concurrently.
+                clients = [GradeServiceClient(port=port) for _ in range(5)]
+                results = await asyncio.gather(*(c.request("GET", "/students?q=sol") for c in clients))
+                self.assertEqual([status for status, _ in results], [200] * 5)
+                for c in clients:
+                    await c.close()
+            finally:
+                await client.close()
+                await service.stop()
+
+        asyncio.run(scenario())
+
+    def test_service_flusher_commits_journal_only(self):
+        print("\n=== Running test_service_flusher_commits_journal_only ===")
+        self.app.save_data()
+        student_mtime = os.stat(STUDENT_FILE).st_mtime_ns
+
+        async def scenario():
+            service = GradeService(self.app, flush_interval=0.01)
+            _, port = await service.start(port=0)
+            client = GradeServiceClient(port=port)
+            try:
+                student = {"Email_address": "tick@example.com", "First_name": "Tia", "Last_name": "Ick",
+                           "Course.id": "CS101", "grades": "A", "Marks": 90}
+                self.assertEqual((await client.request("POST", "/students", student))[0], 201)
+                await asyncio.sleep(0.1)
+                # The periodic flush group-commits the journal; the CSV waits for compaction.
+                self.assertEqual(os.stat(STUDENT_FILE).st_mtime_ns, student_mtime)
+                self.assertIn("tick@example.com", CheckMyGradeApp().student_index)
+            finally:
+                await client.close()
+                await service.stop()
+
+        asyncio.run(scenario())
+
+    def test_write_behind_group_commit(self):
+        print("\n=== Running test_write_behind_group_commit ===")
+        self.app.save_data()
+        app = CheckMyGradeApp(write_behind=True, flush_interval=60, flush_batch=3)
+        app.add_student("Wen", "Bee", "wen@example.com", "WB101", "A", "90")
+        # The mutation is in memory only until the flusher or a durability point writes it.
+        self.assertIn("wen@example.com", app.student_index)
+        self.assertEqual(os.path.getsize(JOURNAL_FILE), 0)
+        app.flush()
+        self.assertIn("wen@example.com", CheckMyGradeApp().student_index)
+        # Reaching flush_batch wakes the flusher, which writes the whole batch in one append.
+        for i in range(3):
+            app.add_student("Grp", str(i), f"grp{i}@example.com", "WB101", "B", "80")
+        deadline = time.time() + 5
+        while app.journal_queue and time.time() < deadline:
+            time.sleep(0.01)
+        with open(JOURNAL_FILE) as f:
+            self.assertEqual(sum(1 for _ in f), 4)
+        # Bulk changes are saved by the flusher instead of the caller; close() is the final flush.
+        added, _ = app.add_students_bulk([{"Email_address": "bulkwb@example.com", "First_name": "B", "Last_name": "W",
+                                           "Course.id": "WB101", "grades": "A", "Marks": "70"}])
+        self.assertEqual(added, 1)
+        app.close()
+        self.assertIsNone(app.flusher)
+        self.assertIn("bulkwb@example.com", [row["Email_address"] for row in load_csv(STUDENT_FILE, STUDENT_HEADERS)])
+        with CheckMyGradeApp(write_behind=True, flush_interval=60) as app:
+            app.delete_student("wen@example.com")
+        self.assertNotIn("wen@example.com", CheckMyGradeApp().student_index)
+
+    def test_crash_safe_csv_writes(self):
+        print("\n=== Running test_crash_safe_csv_writes ===")
+        rows = [{"Grade_id": "G1", "Grade": "A", "Marks_range": "90-100"},
+                {"Grade_id": "G2", "Grade": "B, high", "Marks_range": "80-89"}]
+        save_csv(GRADES_FILE, rows[:1], GRADES_HEADERS)
+        save_csv(GRADES_FILE, rows, GRADES_HEADERS)
+        # Byte-for-byte what csv.DictWriter writes.
+        expected = io.StringIO(newline='')
+        writer = csv.DictWriter(expected, fieldnames=GRADES_HEADERS)
+        writer.writeheader()
+        writer.writerows(rows)
+        with open(GRADES_FILE, newline='') as f:
+            self.assertEqual(f.read(), expected.getvalue())
+        self.assertEqual(load_csv(GRADES_FILE + CSV_BACKUP_SUFFIX, GRADES_HEADERS), rows[:1])
+        # A file torn mid-record is moved aside and restored from the backup instead of being reseeded or loaded half-written.
+        with open(GRADES_FILE, mode='r+b') as f:
+            f.truncate(os.path.getsize(GRADES_FILE) - 12)  # Inside the quoted "B, high".
+        self.assertFalse(csv_intact(GRADES_FILE, GRADES_HEADERS))
+        self.assertEqual(list(CheckMyGradeApp().grade_index), ["G1"])
+        self.assertTrue(csv_intact(GRADES_FILE, GRADES_HEADERS))
+        with open(GRADES_FILE + CSV_CORRUPT_SUFFIX, newline='') as f:
+            self.assertTrue(f.read().endswith('G2,"B, h'))
+        # A hand edit without a final line break is not damage; the edited row is kept.
+        with open(COURSE_FILE, mode='a', newline='') as f:
+            f.write("HAND1,Hand Added,No newline")
+        self.assertTrue(csv_intact(COURSE_FILE, COURSE_HEADERS))
+        self.assertIn("HAND1", CheckMyGradeApp().course_index)
+        self.assertFalse(os.path.exists(COURSE_FILE + CSV_CORRUPT_SUFFIX))
+        # Without an intact backup, a damaged Student.csv is left alone rather than replaced by the sample row.
+        save_csv(STUDENT_FILE, [{"Email_address": "keep@example.com", "First_name": "K", "Last_name": "P",
+                                 "Course.id": "CS101", "grades": "A", "Marks": "90"}], STUDENT_HEADERS, rotate=False)
+        os.remove(STUDENT_FILE + CSV_BACKUP_SUFFIX)
+        with open(STUDENT_FILE, mode='r+b') as f:
+            f.truncate(os.path.getsize(STUDENT_FILE) - 12)  # Leaves "keep@example.com,K,P,".
+        initialize_csv_if_empty()
+        rows = load_csv(STUDENT_FILE, STUDENT_HEADERS)
+        self.assertEqual([row["Email_address"] for row in rows], ["keep@example.com"])
+
+    def test_login_validation(self):
+        print("\n=== Running test_login_validation ===")
+        self.app.add_login_user("hash@example.com", "s3cret", "student")
+        user = self.app.login_index["hash@example.com"]
+        self.assertTrue(user.Password.startswith(PASSWORD_HASH_ALGORITHM + "$"))
+        self.assertTrue(self.app.validate_login("hash@example.com", "s3cret"))
+        self.assertIn("hash@example.com", self.app.login_cache.entries)
+        self.assertTrue(self.app.validate_login("hash@example.com", "s3cret"))  # Served from the cache.
+        self.assertFalse(self.app.validate_login("hash@example.com", "wrong"))
+        self.assertFalse(self.app.validate_login("nobody@example.com", "s3cret"))
+        # The stored verifier is loaded as is, not hashed again.
+        self.assertEqual(CheckMyGradeApp().login_index["hash@example.com"].Password, user.Password)
+        # A legacy base64 password still works and is upgraded to a verifier on its first login.
+        self.app.login_users = [LoginUser.from_row({"User_id": "old@example.com", "Password": "b2xkcHc=", "Role": "student"})]
+        self.assertTrue(self.app.validate_login("old@example.com", "oldpw"))
+        self.assertTrue(check_password(self.app.login_index["old@example.com"].Password, "oldpw"))
+        self.assertTrue(CheckMyGradeApp().validate_login("old@example.com", "oldpw"))
+
+        cache = CredentialCache(maxsize=2)
+        for name in ("a", "b", "c"):
+            cache.add(name, "v", "pw")
+        self.assertEqual(list(cache.entries), ["b", "c"])  # Least recently used evicted.
+        self.assertTrue(cache.check("b", "v", "pw"))
+        self.assertFalse(cache.check("b", "v", "other"))
+        self.assertFalse(cache.check("c", "changed", "pw"))
+        expired = CredentialCache(ttl=-1)
+        expired.add("a", "v", "pw")
+        self.assertFalse(expired.check("a", "v", "pw"))
+
+    def test_metrics_registry(self):
+        print("\n=== Running test_metrics_registry ===")
+        METRICS.reset()
+        self.app.add_student("Met", "Rics", "metrics@example.com", "CS101", "A", "90")
+        self.assertEqual(METRICS.to_json(), {"counters": {}, "operations": {}})  # Disabled by default.
+        METRICS.enabled = True
+        try:
+            self.app.search_students("metrics")
+            self.app.search_students("rics")
+            self.app.update_student("metrics@example.com", Marks="91")
+            with self.assertRaises(KeyError):
+                timed(lambda: {}["missing"])()
+            with METRICS.timer("custom"):
+                pass
+            METRICS.inc("custom_events", 3)
+            save_csv("metrics_test.csv", [{"a": "1"}], ["a"], rotate=False)
+            # Loading a table from its CSV (no snapshot yet) records the parse.
+            if os.path.exists(COURSE_FILE + SNAPSHOT_SUFFIX):
+                os.remove(COURSE_FILE + SNAPSHOT_SUFFIX)
+            CheckMyGradeApp().courses
+        finally:
+            METRICS.enabled = False
+            if os.path.exists("metrics_test.csv"):
+                os.remove("metrics_test.csv")
+        ops = METRICS.to_json()["operations"]
+        self.assertEqual(ops["search_students"]["count"], 2)
+        self.assertEqual(sum(ops["search_students"]["buckets"].values()), 2)
+        self.assertEqual(ops["update_student"]["count"], 1)
+        self.assertIn("save_csv", ops)
+        self.assertEqual(ops["read_csv_rows"]["count"], 1)
+        self.assertIn("custom", ops)
+        self.assertEqual(METRICS.to_json()["counters"], {"<lambda>_errors": 1, "custom_events": 3})
+        text = METRICS.to_prometheus()
+        self.assertIn("checkmygrade_custom_events_total 3", text)
+        self.assertIn("checkmygrade__lambda__errors_total 1", text)
+        self.assertIn('checkmygrade_operation_seconds_count{op="search_students"} 2', text)
+        self.assertIn('checkmygrade_operation_seconds_bucket{op="search_students",le="+Inf"} 2', text)
+        METRICS.reset()
+
+    def test_parallel_csv_parsing(self):
+        print("\n=== Running test_parallel_csv_parsing ===")
+        file = "parallel_test.csv"
+        rows = [{"Email_address": f"p{i}@example.com", "First_name": f"Line\nbreak {i}" if i % 7 == 0 else f"P{i}",
+                 "Last_name": 'Say "hi", twice\r\n""' if i % 5 == 0 else "Plain", "Course.id": f"C{i % 3}",
+                 "grades": "A", "Marks": str(i % 101)} for i in range(3000)]
+        save_csv(file, rows, STUDENT_HEADERS, rotate=False)
+        try:
+            with open(file, mode='a', newline='') as f:
+                f.write("\r\nshort@example.com,Short\r\n")  # A blank line, then a short row.
+            expected = list(iter_csv(file, STUDENT_HEADERS))
+            bounds = csv_record_boundaries(file, 16)
+            self.assertEqual(len(bounds), 17)
+            self.assertEqual(bounds[-1], os.path.getsize(file))
+            self.assertEqual(list(read_csv_rows(file, STUDENT_HEADERS, workers=3, min_bytes=0)), expected)
+            self.assertEqual(expected[-1]["Marks"], None)
+            # A single worker takes the serial path.
+            self.assertEqual(list(read_csv_rows(file, STUDENT_HEADERS, workers=1, min_bytes=0)), expected)
+        finally:
+            os.remove(file)
+
+    def test_unparsable_rows_are_skipped_not_fatal(self):
+        print("\n=== Running test_unparsable_rows_are_skipped_not_fatal ===")
+        save_csv(STUDENT_FILE, [{"Email_address": "good@example.com", "First_name": "Good", "Last_name": "Row",
+                                 "Course.id": "CS101", "grades": "A", "Marks": "90"}], STUDENT_HEADERS)
+        with open(STUDENT_FILE, mode='a', newline='') as f:
+            f.write("bad@example.com,Bad,Row,CS101,A,\r\nworse@example.com,Worse,Row,CS101,A,n/a\r\n")
+        app = CheckMyGradeApp()
+        self.assertEqual([s.Email_address for s in app.students], ["good@example.com"])
+        self.assertEqual(set(app.invalid_rows["student"]), {"bad@example.com", "worse@example.com"})
+        # The bad rows survive a save; a valid record with the same key replaces one.
+        app.add_student("Fixed", "Row", "worse@example.com", "CS101", "B", "80")
+        app.save_data()
+        rows = {row["Email_address"]: row["Marks"] for row in load_csv(STUDENT_FILE, STUDENT_HEADERS)}
+        self.assertEqual(rows, {"good@example.com": "90", "bad@example.com": "", "worse@example.com": "80"})
+        # Bad rows arriving through the journal are set aside the same way.
+        app.write_journal([{"table": "student", "op": "put", "key": "good@example.com", "session": "other",
+                            "row": {"Email_address": "good@example.com", "First_name": "Good", "Last_name": "Row",
+                                    "Course.id": "CS101", "grades": "A", "Marks": "ninety"}}])
+        reloaded = CheckMyGradeApp()
+        self.assertEqual(sorted(s.Email_address for s in reloaded.students), ["worse@example.com"])
+        self.assertIn("good@example.com", reloaded.invalid_rows["student"])
+
+    def test_add_students_bulk(self):
+        print("\n=== Running test_add_students_bulk ===")
+        self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "90")
+        rows = [
+            {"Email_address": "bulk1@example.com", "First_name": "Bulk", "Last_name": "One",
+             "Course.id": "CS101", "grades": "B", "Marks": "81"},
+            {"Email_address": "alice@example.com", "First_name": "Alice", "Last_name": "Again",
+             "Course.id": "CS101", "grades": "A", "Marks": "90"},
+            {"Email_address": "bulk1@example.com", "First_name": "Bulk", "Last_name": "Twice",
+             "Course.id": "CS101", "grades": "B", "Marks": "81"},
+            {"Email_address": "bulk2@example.com", "First_name": "Bulk", "Last_name": "Two",
+             "Course.id": "CS101", "grades": "C", "Marks": "n/a"},
+            {"Email_address": "bulk3@example.com", "First_name": "", "Last_name": "Three",
+             "Course.id": "CS101", "grades": "C", "Marks": "71"},
+            {"Email_address": "bulk4@example.com", "First_name": "Bulk", "Last_name": "Four",
+             "Course.id": "CS101", "grades": "F", "Marks": 0},
+        ]
+        added, errors = self.app.add_students_bulk(rows)
+        self.assertEqual(added, 2)
+        self.assertEqual([(row_no, reason.split()[0]) for row_no, _, reason in errors],
+                         [(2, "duplicate"), (3, "duplicate"), (4, "invalid"), (5, "missing")])
+        self.assertEqual([s.Email_address for s in self.app.students],
+                         ["alice@example.com", "bulk1@example.com", "bulk4@example.com"])
+        self.assertEqual(self.app.student_index["bulk4@example.com"].Marks, 0)
+        self.assertIn("bulk1@example.com", [row["Email_address"] for row in load_csv(STUDENT_FILE, STUDENT_HEADERS)])
+
+    def test_primary_key_indexes(self):
+        print("\n=== Running test_primary_key_indexes ===")
+        self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "90")
+        self.app.add_student("Bob", "Brown", "bob@example.com", "CS101", "B", "85")
+        self.app.add_login_user("alice@example.com", "secret", "student")
+        self.app.add_login_user("alice@example.com", "other", "student")   # Rejected as a duplicate.
+        self.assertEqual(len(self.app.login_users), 1)
+        self.app.delete_student("alice@example.com")
+        self.assertNotIn("alice@example.com", self.app.student_index)
+        self.assertEqual([s.Email_address for s in self.app.students], ["bob@example.com"])
+        # Assigning a list rebuilds the index behind it.
+        self.app.students = [Student("Cara", "Lee", "cara@example.com", "CS101", "A", "93")]
+        self.assertEqual(list(self.app.student_index), ["cara@example.com"])
+
+    def test_course_secondary_indexes(self):
+        print("\n=== Running test_course_secondary_indexes ===")
+        self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "95")
+        self.app.add_student("Bob", "Brown", "bob@example.com", "CS101", "B", "85")
+        self.app.add_professor("prof@example.com", "Dr. Smith", "Senior", "CS101")
+        self.app.update_student("bob@example.com", Course_id="MATH100")
+        self.assertEqual([s.Email_address for s in self.app.students_in_course("CS101")], ["alice@example.com"])
+        self.assertEqual([s.Email_address for s in self.app.students_in_course("MATH100")], ["bob@example.com"])
+        self.app.delete_student("bob@example.com")
+        self.assertNotIn("MATH100", self.app.course_students)
+        self.app.update_professor("prof@example.com", course_id="MATH100")
+        self.assertEqual(self.app.professors_in_course("CS101"), [])
+        self.assertEqual([p.Professor_id for p in self.app.professors_in_course("MATH100")], ["prof@example.com"])
+
+    def test_search_index_queries(self):
+        print("\n=== Running test_search_index_queries ===")
+        self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "95")
+        self.app.add_student("Bob", "Smithers", "bob@example.com", "CS101", "B", "85")
+        self.app.add_student("Al", "Jones", "al@mycsu.edu", "CS101", "C", "75")
+        emails = lambda results: [s.Email_address for s in results]
+        self.assertEqual(emails(self.app.search_students("MITH")), ["alice@example.com", "bob@example.com"])
+        self.assertEqual(emails(self.app.search_students("al", prefix=True)), ["alice@example.com", "al@mycsu.edu"])
+        self.assertEqual(emails(self.app.search_students("ith", prefix=True)), [])
+        self.assertEqual(emails(self.app.search_students("smith bob")), ["bob@example.com"])
+        self.assertEqual(emails(self.app.search_students("e")), ["alice@example.com", "bob@example.com",
+                                                                 "al@mycsu.edu"])
+        self.app.update_student("bob@example.com", Last_name="Baker")
+        self.assertEqual(emails(self.app.search_students("smith")), ["alice@example.com"])
+        self.app.delete_student("alice@example.com")
+        self.assertEqual(emails(self.app.search_students("smith")), [])
+
+    def test_typed_marks_and_marks_order(self):
+        print("\n=== Running test_typed_marks_and_marks_order ===")
+        self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "90")
+        self.app.add_student("Bob", "Brown", "bob@example.com", "CS101", "B", "85.5")
+        self.app.add_student("Cara", "Lee", "cara@example.com", "CS101", "A", "90")
+        self.app.add_student("Dan", "Ray", "dan@example.com", "CS101", "A", "ninety")   # Rejected.
+        self.assertEqual([s.Marks for s in self.app.students], [90, 85.5, 90])
+        self.app.update_student("bob@example.com", Marks="abc")                          # Rejected.
+        self.assertEqual(self.app.student_index["bob@example.com"].Marks, 85.5)
+        emails = lambda results: [s.Email_address for s in results]
+        self.assertEqual(emails(self.app.sort_students_by_marks()),
+                         ["bob@example.com", "alice@example.com", "cara@example.com"])
+        self.assertEqual(emails(self.app.sort_students_by_marks(reverse=True)),
+                         ["alice@example.com", "cara@example.com", "bob@example.com"])
+        self.app.update_student("bob@example.com", Marks="99")
+        self.assertEqual(self.app.marks_index.descending(1), ["bob@example.com"])
+        self.assertEqual(self.app.student_index["bob@example.com"].to_dict()["Marks"], 99)
+
+    def test_top_bottom_percentile_and_rank(self):
+        print("\n=== Running test_top_bottom_percentile_and_rank ===")
+        for i, marks in enumerate([70, 95, 80, 95, 60]):
+            self.app.add_student(f"First{i}", f"Last{i}", f"s{i}@example.com", "CS101", "A", str(marks))
+        self.app.add_student("Dee", "Ma", "dee@example.com", "DATA200", "A", "99")
+        emails = lambda results: [s.Email_address for s in results]
+        self.assertEqual(emails(self.app.top_students(2)), ["dee@example.com", "s1@example.com"])
+        self.assertEqual(emails(self.app.top_students(2, course_id="CS101")), ["s1@example.com", "s3@example.com"])
+        self.assertEqual(emails(self.app.bottom_students(2, course_id="CS101")), ["s4@example.com", "s0@example.com"])
+        self.assertEqual(emails(self.app.percentile_students(20, course_id="CS101")), ["s4@example.com"])
+        self.assertEqual(emails(self.app.percentile_students(10, top=True)), ["dee@example.com"])
+        self.assertEqual(self.app.rank_of_student("dee@example.com"), 1)
+        self.assertEqual(self.app.rank_of_student("s3@example.com"), 2)     # Tied with s1.
+        self.assertEqual(self.app.rank_of_student("s3@example.com", course_id="CS101"), 1)
+        self.assertEqual(self.app.rank_of_student("s4@example.com"), 6)
+        self.assertIsNone(self.app.rank_of_student("dee@example.com", course_id="CS101"))
+        self.app.update_student("s4@example.com", Course_id="DATA200", Marks="100")
+        self.assertEqual(self.app.rank_of_student("s4@example.com", course_id="DATA200"), 1)
+        self.assertEqual(len(self.app.marks_index_for("CS101")), 4)
+
+    def test_incremental_course_aggregates(self):
+        print("\n=== Running test_incremental_course_aggregates ===")
+        for i, marks in enumerate([80, 90, 70, 60]):
+            self.app.add_student(f"First{i}", f"Last{i}", f"s{i}@example.com", "CS101", "B", str(marks))
+        self.app.update_student("s3@example.com", Marks="100")
+        self.app.delete_student("s2@example.com")
+        summary = self.app.course_summary("CS101")
+        self.assertEqual((summary["count"], summary["min"], summary["max"], summary["median"]), (3, 80, 100, 90))
+        self.assertAlmostEqual(summary["mean"], 90)
+        self.assertAlmostEqual(summary["stdev"], statistics.pstdev([80, 90, 100]))
+        self.assertAlmostEqual(self.app.course_percentile("CS101", 25), 85)
+        self.app.update_student("s0@example.com", Course_id="DATA200")
+        self.assertEqual(self.app.calculate_course_statistics("CS101"), (95, 95))
+        self.assertIsNone(self.app.course_summary("NOPE"))
+
+    def test_marks_index_blocks(self):
+        print("\n=== Running test_marks_index_blocks ===")
+        # Tiny blocks, so adds and removes split and empty blocks; a plain sorted list is the reference.
+        index = MarksIndex()
+        index.BLOCK_SIZE = 2
+        reference = {}
+        for i in range(200):
+            key = f"k{i * 7 % 50}"
+            if i % 5 == 4:
+                index.remove(key)
+                reference.pop(key, None)
+            else:
+                index.add(key, i * 13 % 17)
+                reference[key] = i * 13 % 17
+            expected = sorted(reference, key=lambda k: (reference[k], index.sort_keys[k][1]))
+            self.assertEqual(index.ascending(), expected)
+        self.assertEqual(len(index), len(reference))
+        self.assertEqual(index.between(5, 9), [k for k in expected if 5 <= reference[k] < 9])
+        self.assertEqual(index.descending(3), sorted(expected, key=lambda k: -reference[k])[:3])
+        self.assertEqual((index.minimum(), index.maximum()), (min(reference.values()), max(reference.values())))
+        self.assertEqual(index.median(), statistics.median(reference.values()))
+        self.assertEqual(index.rank(expected[0]), 1 + sum(v > reference[expected[0]] for v in reference.values()))
+
+    def test_slotted_entities_and_streaming_loader(self):
+        print("\n=== Running test_slotted_entities_and_streaming_loader ===")
+        entities = [Student("A", "B", "a@example.com", "CS101", "A", "90"), Course("CS101", "Intro", "Desc"),
+                    Professor("p@example.com", "P", "Senior", "CS101"), Grades("G1", "A", "90-100"),
+                    LoginUser("a@example.com", "pw", "student")]
+        for entity in entities:
+            self.assertFalse(hasattr(entity, "__dict__"))
+        self.app.add_student("Alice", "Smith", "alice@example.com", "CS101", "A", "90")
+        self.app.mark_dirty("student")
+        self.app.save_data()
+        rows = iter_csv(STUDENT_FILE, STUDENT_HEADERS)
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual([row["Email_address"] for row in rows], ["alice@example.com"])
+
+    def test_lazy_table_loading(self):
+        print("\n=== Running test_lazy_table_loading ===")
+        self.app.save_data()
+        self.app.add_login_user("lazy@example.com", "pw", "student")
+        app = CheckMyGradeApp()
+        self.assertEqual(app.loaded_tables, set())
+        self.assertIn("lazy@example.com", app.login_index)
+        self.assertEqual(app.loaded_tables, {"login"})
+        # Compaction must not drop journaled changes to tables this session never loaded.
+        other = CheckMyGradeApp()
+        other.add_course("LZY101", "Lazy Loading", "Touches only the course table")
+        other.save_data()
+        self.assertIn("lazy@example.com", [row["User_id"] for row in load_csv(LOGIN_FILE, LOGIN_HEADERS)])
+        self.assertNotIn("student", other.loaded_tables)
+
+    def test_assigning_a_table_saves_it(self):
+        print("\n=== Running test_assigning_a_table_saves_it ===")
+        self.app.courses = [Course("ASG101", "Assigned", "Replaces the course table")]
+        self.assertIn("course", self.app.dirty_tables)
+        self.app.save_data()
+        self.assertEqual([row["Course_id"] for row in load_csv(COURSE_FILE, COURSE_HEADERS)], ["ASG101"])
+        self.assertEqual(list(CheckMyGradeApp().course_index), ["ASG101"])
+
+    def test_binary_snapshots(self):
+        print("\n=== Running test_binary_snapshots ===")
+        self.app.add_course("SNP101", "Snapshots", "Binary cache of the course table")
+        self.app.save_data()
+        rows = load_snapshot(COURSE_FILE, COURSE_HEADERS)
+        self.assertEqual(rows, [tuple(row[h] for h in COURSE_HEADERS) for row in load_csv(COURSE_FILE, COURSE_HEADERS)])
+        self.assertIn("SNP101", CheckMyGradeApp().course_index)
+        # A CSV edited outside the app makes the snapshot stale; a corrupt snapshot is ignored.
+        save_csv(COURSE_FILE, [{"Course_id": "EXT101", "Course_name": "Edited", "Description": "By hand"}], COURSE_HEADERS)
+        self.assertIsNone(load_snapshot(COURSE_FILE, COURSE_HEADERS))
+        self.assertEqual(list(CheckMyGradeApp().course_index), ["EXT101"])
+        with open(COURSE_FILE + SNAPSHOT_SUFFIX, mode='wb') as f:
+            f.write(SNAPSHOT_MAGIC + b'garbage')
+        self.assertEqual(list(CheckMyGradeApp().course_index), ["EXT101"])
+        self.assertIsNotNone(load_snapshot(COURSE_FILE, COURSE_HEADERS))
+        # Snapshots are best-effort: one that cannot be written never fails a load or a save, nor leaves a temp file.
+        os.remove(COURSE_FILE + SNAPSHOT_SUFFIX)
+        os.mkdir(COURSE_FILE + SNAPSHOT_SUFFIX)
+        app = CheckMyGradeApp()
+        self.assertEqual(list(app.course_index), ["EXT101"])
+        app.add_course("SNP102", "Snapshots", "Saved without a snapshot")
+        app.save_data()
+        self.assertIn("SNP102", [row["Course_id"] for row in load_csv(COURSE_FILE, COURSE_HEADERS)])
+        self.assertEqual([name for name in os.listdir() if name.endswith('.tmp')], [])
+        os.rmdir(COURSE_FILE + SNAPSHOT_SUFFIX)
+        # Rows are written in chunks, so a table larger than one chunk round-trips too.
+        rows = [(f"c{i}@example.com", "F", "L", "C1", "A", str(i % 100)) for i in range(SNAPSHOT_CHUNK_ROWS + 5)]
+        CsvStorage().save_table("student", (dict(zip(STUDENT_HEADERS, row)) for row in rows))
+        self.assertEqual(load_snapshot(STUDENT_FILE, STUDENT_HEADERS), rows)
+        # The payload is plain UTF-8 text; a field it cannot represent (NUL) just means no snapshot.
+        with open(STUDENT_FILE + SNAPSHOT_SUFFIX, mode='rb') as f:
+            self.assertIn("c7@example.com\0F\0L".encode('utf-8'), f.read())
+        CsvStorage().save_table("student", [dict(zip(STUDENT_HEADERS, ("nul@example.com", "N\0L", "L", "C1", "A", "1")))])
+        self.assertIsNone(load_snapshot(STUDENT_FILE, STUDENT_HEADERS))
+        self.assertEqual(list(CheckMyGradeApp().student_index), ["nul@example.com"])
+
+    def test_sqlite_storage(self):
+        print("\n=== Running test_sqlite_storage ===")
+        db_file = "test_CheckMyGrade.db"
+        if os.path.exists(db_file):
+            os.remove(db_file)
+        app = CheckMyGradeApp(storage=SqliteStorage(db_file))
+        self.assertEqual([s.Email_address for s in app.students], ["sam@mycsu.edu"])
+        app.add_student("Lina", "Park", "lina@example.com", "SQL101", "A", "91")
+        app.add_student("Omar", "Diaz", "omar@example.com", "SQL101", "B", "84")
+        app.update_student("sam@mycsu.edu", Marks="97.5")
+        app.delete_student("omar@example.com")
+        app.add_course("SQL101", "Databases", "Relational storage")
+        self.assertEqual(app.journal_entries, 0)
+        app.storage.close()
+
+        # Every mutation was committed as it happened; a new app sees it without save_data().
+        reopened = CheckMyGradeApp(storage=SqliteStorage(db_file))
+        self.assertEqual([(s.Email_address, s.Marks) for s in reopened.students],
+                         [("sam@mycsu.edu", 97.5), ("lina@example.com", 91)])
+        self.assertEqual([s.First_name for s in reopened.search_students("lina")], ["Lina"])
+        self.assertEqual(reopened.calculate_course_statistics("SQL101"), (91, 91))
+        self.assertIn("SQL101", reopened.course_index)
+        indexes = {row[1] for row in reopened.storage.conn.execute("PRAGMA index_list(student)")}
+        self.assertIn("student_course_id", indexes)
+        # A bulk import in one session applies just its rows; a row another session committed meanwhile stays.
+        other = CheckMyGradeApp(storage=SqliteStorage(db_file))
+        other.students  # Loaded before the first session's add.
+        reopened.add_student("Ana", "Cruz", "ana@example.com", "SQL101", "A", "95")
+        other.add_students_bulk([{"Email_address": "bulk@example.com", "First_name": "Bulk", "Last_name": "Row",
+                                  "Course.id": "SQL101", "grades": "B", "Marks": "80"}])
+        other.storage.close()
+        self.assertEqual([row["Email_address"] for row in reopened.storage.load_rows("student")],
+                         ["sam@mycsu.edu", "lina@example.com", "ana@example.com", "bulk@example.com"])
+        reopened.storage.close()
+
+        # The migration copies the CSV rows as stored.
+        self.app.add_course("MIG101", "Migration", "Copied to SQLite")
+        counts = migrate_csv_to_sqlite(db_file)
+        self.assertEqual(counts["course"], len(load_csv(COURSE_FILE, COURSE_HEADERS)))
+        migrated = CheckMyGradeApp(storage=SqliteStorage(db_file))
+        self.assertEqual(list(migrated.course_index), [row["Course_id"] for row in load_csv(COURSE_FILE, COURSE_HEADERS)])
+        self.assertIn("MIG101", migrated.course_index)
+        migrated.storage.close()
+        os.remove(db_file)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_columnar_store_matches_objects(self):
+        print("\n=== Running test_columnar_store_matches_objects ===")
+        app = CheckMyGradeApp(columnar=True)
+        app.students = []
+        # Enough rows to grow the columns past their initial capacity.
+        app.add_students_bulk({"Email_address": f"c{i}@example.com", "First_name": f"F{i}", "Last_name": f"L{i}",
+                               "Course.id": f"C{i % 7}", "grades": "AB"[i % 2], "Marks": str(40 + i % 61)}
+                              for i in range(1500))
+        app.delete_student("c0@example.com")
+        app.update_student("c1@example.com", Course_id="C0", Marks="99", grades="A")
+        stats = app.columns.course_statistics()
+        for course_id in (f"C{i}" for i in range(7)):
+            avg, med = app.calculate_course_statistics(course_id)
+            self.assertEqual(stats[course_id][0], len(app.students_in_course(course_id)))
+            self.assertAlmostEqual(stats[course_id][1], avg)
+            self.assertAlmostEqual(stats[course_id][2], med)
+        self.assertEqual(app.grade_histogram(), dict(Counter(s.grades for s in app.students)))
+        self.assertEqual(app.grade_histogram("C0"), dict(Counter(s.grades for s in app.students_in_course("C0"))))
+
 
 # Demo & Main Execution Block
 # ============================================================
@@ -731,10 +4043,27 @@ def run_tests_and_demo():
     print("\n--- Professor-wise Report ---")
     app.report_by_professor()
 
-def run_cli():
-    # Create an instance of the application.
-    app = CheckMyGradeApp()
+def run_cli(storage=None, profile=False):
+    # Create an instance of the application (CSV storage unless another backend is given).
+    # Edits are written behind by a background thread and flushed when the CLI exits.
+    with CheckMyGradeApp(storage=storage, write_behind=True) as app:
+        run_cli_loop(app, profile)
+
+PROFILE_TOP = 20   # Functions listed per profiled CLI command.
+
+def print_profile(profiler):
+    """Stops a profiler and prints its busiest functions by cumulative time."""
+    profiler.disable()
+    pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+def run_cli_loop(app, profile=False):
+    # With profile on (option 24), every command runs under cProfile; "p<choice>" profiles just one.
+    profiler = None
     while True:
+        if profiler is not None:
+            print_profile(profiler)  # Of the command that just finished.
+            profiler = None
+
         # Display the main menu.
         print("\n--- CheckMyGrade Application ---")
         print("1. Add Student")
@@ -756,10 +4085,21 @@ def run_cli():
         print("17. Display All Login Users")
         print("18. Report by Course")
         print("19. Report by Professor")
+        print("20. Bulk Import Students from CSV")
+        print("21. Export or Page a Report")
+        print("22. Regrade Students from Marks Ranges")
+        print("23. Metrics (on/off/json/prometheus/reset)")
+        print(f"24. Turn Profiling {'Off' if profile else 'On'} (or prefix one choice with p, e.g. p5)")
         print("0. Exit")
         
         # Prompt for user input.
         choice = input("Enter your choice: ").strip()
+        profile_command = profile
+        if choice.startswith("p"):
+            choice, profile_command = choice[1:], True
+        if profile_command and choice not in ("0", "24"):
+            profiler = cProfile.Profile()
+            profiler.enable()
         
         # Process user input:
         if choice == "1":
@@ -851,11 +4191,50 @@ def run_cli():
         elif choice == "17":
             print("\n--- All Login Users ---")
             for u in app.login_users:
-                print(f"{u.User_id} | Role: {u.Role} | Encrypted Password: {u.Password}")
+                print(f"{u.User_id} | Role: {u.Role} | Password Hash: {u.Password}")
         elif choice == "18":
             app.report_by_course()
         elif choice == "19":
             app.report_by_professor()
+        elif choice == "20":
+            file = input("CSV file to import: ").strip()
+            import_students_from_csv(app, file)
+        elif choice == "21":
+            reports = {"students": app.display_all_students, "course": app.report_by_course,
+                       "professor": app.report_by_professor, "student": app.report_by_student}
+            name = input("Report (students/course/professor/student): ").strip().lower()
+            output = input("Output (paged/csv/jsonl): ").strip().lower()
+            if name not in reports or output not in ("paged", "csv", "jsonl"):
+                print("Invalid report or output.")
+            elif output == "paged":
+                reports[name](PagedSink())
+            else:
+                file = input("Output file: ").strip()
+                reports[name](CsvSink(file) if output == "csv" else JsonLinesSink(file))
+                print(f"Report written to {file}.")
+        elif choice == "22":
+            course_id = input("Course ID (leave empty for all students): ").strip()
+            if course_id:
+                app.regrade_course(course_id)
+            else:
+                app.regrade_all()
+        elif choice == "23":
+            action = input("on, off, json, prometheus or reset: ").strip().lower()
+            if action in ("on", "off"):
+                METRICS.enabled = action == "on"
+                print(f"Metrics {action}.")
+            elif action == "json":
+                print(json.dumps(METRICS.to_json(), indent=2))
+            elif action == "prometheus":
+                print(METRICS.to_prometheus(), end="")
+            elif action == "reset":
+                METRICS.reset()
+                print("Metrics reset.")
+            else:
+                print("Invalid choice.")
+        elif choice == "24":
+            profile = not profile
+            print(f"Profiling {'on' if profile else 'off'}.")
         elif choice == "0":
             print("Exiting application.")
             break
@@ -866,6 +4245,45 @@ def run_cli():
 # Main Execution Block
 # ============================================================
 if __name__ == "__main__":
+    # Local HTTP/JSON service: python ChaudharyViraat_LAB1.py serve [port]
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "serve":
+        run_service(port=int(sys.argv[2]) if len(sys.argv) == 3 else SERVICE_PORT)
+        sys.exit(0)
+
+    # CSV writer benchmark: python ChaudharyViraat_LAB1.py bench-save-csv [rows]
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "bench-save-csv":
+        benchmark_save_csv(int(sys.argv[2]) if len(sys.argv) == 3 else 1_000_000)
+        sys.exit(0)
+
+    # Benchmark suite: python ChaudharyViraat_LAB1.py bench [--sizes 1000,10000] [--output results.json] [--baseline old.json]
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        parser = argparse.ArgumentParser(prog="ChaudharyViraat_LAB1.py bench")
+        parser.add_argument("--sizes", default=",".join(map(str, BENCHMARK_SIZES)), help="comma-separated student counts")
+        parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT)
+        parser.add_argument("--warmup", type=int, default=BENCHMARK_WARMUP)
+        parser.add_argument("--output", help="write the JSON results here")
+        parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+        parser.add_argument("--tolerance", type=float, default=BENCHMARK_TOLERANCE)
+        args = parser.parse_args(sys.argv[2:])
+        report = run_benchmarks([int(n) for n in args.sizes.split(",")], args.repeat, args.warmup,
+                                args.output, args.baseline, args.tolerance)
+        sys.exit(1 if report.get("regressions") else 0)
+
+    # Non-interactive bulk import: python ChaudharyViraat_LAB1.py import-students <file.csv>
+    if len(sys.argv) == 3 and sys.argv[1] == "import-students":
+        import_students_from_csv(CheckMyGradeApp(), sys.argv[2])
+        sys.exit(0)
+
+    # One-shot CSV -> SQLite migration: python ChaudharyViraat_LAB1.py migrate-sqlite [CheckMyGrade.db]
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "migrate-sqlite":
+        migrate_csv_to_sqlite(*sys.argv[2:])
+        sys.exit(0)
+
+    # Interactive CLI on the SQLite backend: python ChaudharyViraat_LAB1.py sqlite [CheckMyGrade.db]
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "sqlite":
+        run_cli(SqliteStorage(*sys.argv[2:]))
+        sys.exit(0)
+
     # To run unit tests and demo first, uncomment the next line and comment out run_cli().
     run_tests_and_demo()
     